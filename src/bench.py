@@ -1,17 +1,76 @@
 import csv
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Iterable, List, Optional
 
+import numpy as np
 from rich.console import Console
 
+from src import layout
 from src.config import settings
 from src.data_gen import DataGenerator
-from src.profiling_utils import measure_seconds
-from src.variants_registry import EXTENSIONS, VARIANT_REGISTRY
+from src.pipeline import DEFAULT_BATCH_ROWS, iter_batches, run_pipelined
+from src.profiling_utils import (
+    cache_sizes,
+    fits_in_cache,
+    measure_seconds,
+    process_memory_kb,
+)
+from src.results import result_table, to_rows
+from src.variants_registry import (
+    EXTENSIONS,
+    JOIN_REGISTRY,
+    get_handler,
+    get_join_handler,
+    get_prepare,
+    get_registry,
+    get_transform,
+)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from src.sketches import SketchAggregator
 
 console = Console()
 
 DEFAULT_SIZES_KB = [16, 64, 256, 1024, 4096]
+DEFAULT_PIPELINE_FORMATS = ["parquet", "csv", "jsonl"]
+DEFAULT_QUEUE_DEPTHS = [0, 1, 2, 4]
+DEFAULT_HLL_PRECISIONS = [8, 10, 12, 14]
+DEFAULT_KLL_KS = [50, 100, 200, 400]
+DEFAULT_DUCKDB_ROWS = [100_000, 1_000_000, 5_000_000]
+DEFAULT_SCALING_SIZES_MB = [16, 128, 1024, 4096]
+SCALING_CHUNK_ROWS = 1_000_000
+DUCKDB_LIMIT_FRACTION = 0.6  # DuckDB memory_limit as a share of the process cap
+# Matched case-insensitively against the capped worker's stderr.
+OOM_MARKERS = (
+    "MemoryError",
+    "Out of Memory",
+    "bad_alloc",
+    "Cannot allocate memory",  # ENOMEM, incl. "... for thread-local data"
+    "[Errno 12]",
+    "memory allocation of",  # Rust (Polars) allocation failure before abort
+    "failed to map segment from shared object",  # dlopen under RLIMIT_AS
+    "can't start new thread",  # thread stacks refused under RLIMIT_AS
+    "Failed to launch worker thread",  # Arrow thread pool, same cause (EAGAIN)
+)
+DEFAULT_JOIN_CARDINALITIES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_JOIN_FACT_ROWS = 2_000_000
+DEFAULT_LAYOUT_SIZES_KB = [16, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576]
+MAX_OBJECT_ROWS = 5_000_000  # Python objects cost ~100B/row; cap the slowest layout
+DEFAULT_PARALLEL_WORKERS = [1, 2, 4, 8]
+DEFAULT_SKEW_CARDINALITIES = [4, 1_000, 1_000_000, 2**64]
+DEFAULT_SKEWS = ["uniform", "zipf", "hotspot"]
+DEFAULT_RESULT_CARDINALITIES = [4, 10_000, 1_000_000]
+HEAVY_MODULES = ("numpy", "pyarrow", "pandas", "polars", "duckdb")
 EST_BYTES_PER_ROW = 48  # rough estimate for sizing rows to working set
 
 
@@ -20,26 +79,38 @@ def _rows_for_kb(size_kb: int) -> int:
 
 
 def sweep(
-    variants: Iterable[str] = ("a", "b", "c", "d", "e", "f", "g"),
+    variants: Iterable[str] = ("a", "b", "c", "d", "e", "f", "g", "h", "i", "j"),
     sizes_kb: Iterable[int] = DEFAULT_SIZES_KB,
     seed: int = settings.SEED,
+    in_memory: bool = False,
+    generator_options: Optional[dict] = None,
 ) -> List[dict]:
     """
     Run a batch-size sweep across variants and working set sizes.
+
+    With `in_memory`, each size is decoded once and every variant's transform
+    runs on the same Arrow table, so only the transform is timed.
+    `generator_options` are passed to `DataGenerator` (key cardinality, skew,
+    value distribution); the dataset filenames carry a matching tag.
     """
+    generator = DataGenerator(seed=seed, **(generator_options or {}))
+    if in_memory:
+        return _sweep_in_memory(variants, sizes_kb, generator)
     results: List[dict] = []
-    generator = DataGenerator(seed=seed)
+    tag = generator.distribution_tag()
+    registry = get_registry()
 
     for variant_key in variants:
-        if variant_key not in VARIANT_REGISTRY:
+        if variant_key not in registry:
             console.print(f"[red]Skipping unknown variant {variant_key}[/red]")
             continue
-        info = VARIANT_REGISTRY[variant_key]
+        info = registry[variant_key]
         fmt = info["default_format"]
-        handler = info["handler"]
+        handler = get_handler(variant_key)
+        prepare = get_prepare(variant_key)
         for size_kb in sizes_kb:
             rows = _rows_for_kb(size_kb)
-            dataset_path = settings.DATA_DIR / f"sweep_{variant_key}_{size_kb}kb.{EXTENSIONS[fmt]}"
+            dataset_path = settings.DATA_DIR / f"sweep_{variant_key}_{size_kb}kb{tag}.{EXTENSIONS[fmt]}"
 
             if not dataset_path.exists():
                 console.print(
@@ -47,6 +118,8 @@ def sweep(
                     f"for variant {variant_key.upper()} -> {dataset_path}"
                 )
                 generator.generate_and_save(rows, fmt=fmt, output_path=dataset_path)
+            if prepare is not None:
+                prepare(dataset_path)
 
             console.print(
                 f"[bold green]Running variant {variant_key.upper()}[/bold green] "
@@ -66,6 +139,937 @@ def sweep(
     return results
 
 
+def _sweep_in_memory(
+    variants: Iterable[str], sizes_kb: Iterable[int], generator: DataGenerator
+) -> List[dict]:
+    from src.shm_dataset import read_table
+
+    results: List[dict] = []
+    registry = get_registry()
+    variants = [v for v in variants if v in registry]
+    tag = generator.distribution_tag()
+    for size_kb in sizes_kb:
+        rows = _rows_for_kb(size_kb)
+        dataset_path = settings.DATA_DIR / f"sweep_{size_kb}kb{tag}.parquet"
+        if not dataset_path.exists():
+            console.print(
+                f"[yellow]Generating[/yellow] {rows:,} rows ({size_kb}KB target) -> {dataset_path}"
+            )
+            generator.generate_and_save(rows, fmt="parquet", output_path=dataset_path)
+        table = read_table(dataset_path)
+        for variant_key in variants:
+            transform = get_transform(variant_key)
+            if transform is None:
+                console.print(f"[yellow]Variant {variant_key} has no in-memory mode[/yellow]")
+                continue
+            console.print(
+                f"[bold green]Transforming variant {variant_key.upper()}[/bold green] "
+                f"size={size_kb}KB rows={rows:,}"
+            )
+            _, duration = measure_seconds(transform, table)
+            results.append(
+                {
+                    "variant": variant_key,
+                    "variant_name": registry[variant_key]["name"],
+                    "size_kb": size_kb,
+                    "rows": rows,
+                    "seconds": duration,
+                    "throughput_rows_per_s": rows / duration if duration > 0 else 0,
+                }
+            )
+    return results
+
+
+def skew_sweep(
+    variants: Iterable[str],
+    cardinalities: Iterable[int] = DEFAULT_SKEW_CARDINALITIES,
+    skews: Iterable[str] = DEFAULT_SKEWS,
+    rows: int = settings.DEFAULT_ROWS,
+    seed: int = settings.SEED,
+    zipf_exponent: float = 1.1,
+    hot_fraction: float = 0.9,
+    repeats: int = 3,
+) -> List[dict]:
+    """
+    Group-by throughput per variant as `event_types` cardinality and skew grow.
+
+    Each (cardinality, skew) dataset is decoded once and every variant's
+    in-memory transform runs on it, so only the aggregation is timed. Each
+    point is the fastest of `repeats` runs after one untimed warm-up (lazy
+    imports, DuckDB connection). `relative_throughput` is against the
+    variant's first (lowest-cardinality, first-skew) dataset.
+    """
+    from src.shm_dataset import read_table
+
+    registry = get_registry()
+    variants = [v for v in variants if v in registry and get_transform(v) is not None]
+    baselines: dict[str, float] = {}
+    results: List[dict] = []
+    for cardinality in sorted(cardinalities):
+        for skew in skews:
+            generator = DataGenerator(
+                seed=seed,
+                key_cardinality=cardinality,
+                key_skew=skew,
+                zipf_exponent=zipf_exponent,
+                hot_fraction=hot_fraction,
+            )
+            dataset_path = settings.DATA_DIR / f"skew_{rows}{generator.distribution_tag()}.parquet"
+            if not dataset_path.exists():
+                console.print(f"[yellow]Generating[/yellow] {rows:,} rows -> {dataset_path}")
+                generator.generate_and_save(rows, fmt="parquet", output_path=dataset_path)
+            table = read_table(dataset_path, columns=["event_types", "values"])
+            _, key_counts = np.unique(table["event_types"].to_numpy(), return_counts=True)
+            for variant_key in variants:
+                console.print(
+                    f"[bold green]Group-by[/bold green] variant={variant_key.upper()} "
+                    f"cardinality={cardinality:,} skew={skew}"
+                )
+                transform = get_transform(variant_key)
+                transform(table)  # warm-up
+                duration = min(measure_seconds(transform, table)[1] for _ in range(repeats))
+                throughput = rows / duration if duration > 0 else 0
+                baseline = baselines.setdefault(variant_key, throughput)
+                results.append(
+                    {
+                        "variant": variant_key,
+                        "variant_name": registry[variant_key]["name"],
+                        "key_cardinality": cardinality,
+                        "skew": skew,
+                        "rows": rows,
+                        "distinct_keys": len(key_counts),
+                        "hottest_key_share": key_counts.max() / rows,
+                        "seconds": duration,
+                        "throughput_rows_per_s": throughput,
+                        "relative_throughput": throughput / baseline if baseline else 0,
+                    }
+                )
+    return results
+
+
+def result_materialization(
+    variants: Iterable[str],
+    cardinalities: Iterable[int] = DEFAULT_RESULT_CARDINALITIES,
+    rows: int = settings.DEFAULT_ROWS,
+    seed: int = settings.SEED,
+) -> List[dict]:
+    """
+    Cost of turning each variant's Arrow result into Python dicts, as the
+    number of output groups grows.
+
+    `transform_seconds` covers the aggregation up to its Arrow result;
+    `to_rows_seconds` is the `list[dict]` conversion that is now deferred to
+    the CLI display edge. `materialize_share` is the fraction of the total
+    that conversion would add if it stayed on the hot path.
+    """
+    from src.shm_dataset import read_table
+
+    registry = get_registry()
+    variants = [v for v in variants if v in registry and get_transform(v) is not None]
+    results: List[dict] = []
+    for cardinality in sorted(cardinalities):
+        generator = DataGenerator(seed=seed, key_cardinality=cardinality)
+        dataset_path = settings.DATA_DIR / f"materialize_{rows}{generator.distribution_tag()}.parquet"
+        if not dataset_path.exists():
+            console.print(f"[yellow]Generating[/yellow] {rows:,} rows -> {dataset_path}")
+            generator.generate_and_save(rows, fmt="parquet", output_path=dataset_path)
+        table = read_table(dataset_path, columns=["event_types", "values"])
+        for variant_key in variants:
+            console.print(
+                f"[bold green]Materialize[/bold green] variant={variant_key.upper()} "
+                f"cardinality={cardinality:,}"
+            )
+            result, transform_seconds = measure_seconds(get_transform(variant_key), table)
+            _, to_rows_seconds = measure_seconds(to_rows, result)
+            total = transform_seconds + to_rows_seconds
+            results.append(
+                {
+                    "variant": variant_key,
+                    "variant_name": registry[variant_key]["name"],
+                    "key_cardinality": cardinality,
+                    "rows": rows,
+                    "result_rows": result.num_rows,
+                    "result_bytes": result.nbytes,
+                    "transform_seconds": transform_seconds,
+                    "to_rows_seconds": to_rows_seconds,
+                    "materialize_share": to_rows_seconds / total if total > 0 else 0,
+                }
+            )
+    return results
+
+
+def _init_transform_worker(variant_key: str) -> None:
+    get_transform(variant_key)  # import outside the timed region
+
+
+def _sketch_partition(table: "pa.Table", seed: int) -> "SketchAggregator":
+    from src.sketches import SketchAggregator
+
+    sketch = SketchAggregator(seed=seed)
+    for batch in table.select(SketchAggregator.columns).to_batches():
+        sketch.update(batch)
+    return sketch
+
+
+def _process_partition(variant_key: str, partition: "pa.Table", sketch_seed: Optional[int]) -> dict:
+    rows, transform_seconds = measure_seconds(get_transform(variant_key), partition)
+    sketch, sketch_seconds = (
+        measure_seconds(_sketch_partition, partition, sketch_seed)
+        if sketch_seed is not None
+        else (None, 0.0)
+    )
+    return {
+        "rows": rows,
+        "sketch": sketch,
+        "transform_seconds": transform_seconds,
+        "sketch_seconds": sketch_seconds,
+        **process_memory_kb(),
+    }
+
+
+def _transform_partition(
+    variant_key: str, source, start: int, length: int, sketch_seed: Optional[int] = None
+) -> dict:
+    """
+    Worker body for `parallel_transform`. `source` is a dataset path (each
+    worker decodes its own copy) or a shared-memory handle (attach zero-copy).
+    Extract time is the decode in file mode and the attach in shared mode.
+    With `sketch_seed` set, the partition is also sketched for merging.
+    """
+    from src.shm_dataset import attach, read_table
+
+    if isinstance(source, Path):
+        table, extract_seconds = measure_seconds(read_table, source)
+        result = _process_partition(variant_key, table.slice(start, length), sketch_seed)
+    else:
+        dataset, extract_seconds = measure_seconds(attach, source)
+        with dataset:
+            result = _process_partition(
+                variant_key, dataset.table.slice(start, length), sketch_seed
+            )
+    return {**result, "extract_seconds": extract_seconds}
+
+
+def _run_partitions(
+    pool: ProcessPoolExecutor,
+    variant_key: str,
+    source,
+    bounds: List[int],
+    sketch_seed: Optional[int] = None,
+) -> List[dict]:
+    futures = [
+        pool.submit(
+            _transform_partition,
+            variant_key,
+            source,
+            start,
+            stop - start,
+            None if sketch_seed is None else sketch_seed + i,
+        )
+        for i, (start, stop) in enumerate(zip(bounds, bounds[1:]))
+    ]
+    return [f.result() for f in futures]
+
+
+def merge_partial_aggregates(partials: Iterable["pa.Table"]) -> "pa.Table":
+    """Combine per-partition count/sum tables by event type and recompute the mean."""
+    import pyarrow as pa
+
+    merged = (
+        pa.concat_tables(list(partials))
+        .group_by("event_type")
+        .aggregate([("count", "sum"), ("sum", "sum")])
+        .sort_by("event_type")
+    )
+    return result_table(merged["event_type"], merged["count_sum"], merged["sum_sum"])
+
+
+def merge_partial_sketches(partials: Iterable["SketchAggregator"]) -> "SketchAggregator":
+    """Fold per-partition sketches into the first one (HLL max, KLL re-compaction)."""
+    partials = iter(partials)
+    merged = next(partials)
+    for part in partials:
+        merged.merge(part)
+    return merged
+
+
+def parallel_transform(
+    variants: Iterable[str],
+    rows: int = settings.DEFAULT_ROWS,
+    workers_list: Iterable[int] = DEFAULT_PARALLEL_WORKERS,
+    seed: int = settings.SEED,
+    sketch: bool = False,
+) -> List[dict]:
+    """
+    Split one dataset across process workers, comparing per-worker file
+    decoding against attaching a single shared-memory copy.
+
+    Reports wall time, mean per-worker extract and transform time, and the
+    summed RSS and PSS of the workers (PSS counts shared pages once overall).
+    With `sketch`, each worker also builds HLL/KLL sketches of its partition
+    that are merged alongside the partial aggregates.
+    """
+    from src.shm_dataset import SharedDataset
+
+    dataset_path = settings.DATA_DIR / f"parallel_{rows}.parquet"
+    if not dataset_path.exists():
+        console.print(f"[yellow]Generating[/yellow] {rows:,} rows -> {dataset_path}")
+        DataGenerator(seed=seed).generate_and_save(rows, fmt="parquet", output_path=dataset_path)
+
+    registry = get_registry()
+    results: List[dict] = []
+    with SharedDataset.from_path(dataset_path) as shared:
+        for variant_key in variants:
+            if variant_key not in registry or get_transform(variant_key) is None:
+                console.print(f"[red]Skipping variant {variant_key} (no in-memory mode)[/red]")
+                continue
+            for workers in workers_list:
+                bounds = [rows * i // workers for i in range(workers + 1)]
+                for mode, source in (("file", dataset_path), ("shared", shared.handle)):
+                    # Fresh pool per mode so one mode's allocator high-water
+                    # mark doesn't leak into the other's RSS/PSS readings.
+                    with ProcessPoolExecutor(
+                        max_workers=workers,
+                        initializer=_init_transform_worker,
+                        initargs=(variant_key,),
+                    ) as pool:
+                        console.print(
+                            f"[bold green]Parallel[/bold green] variant={variant_key.upper()} "
+                            f"workers={workers} mode={mode}"
+                        )
+                        futures, wall = measure_seconds(
+                            _run_partitions,
+                            pool,
+                            variant_key,
+                            source,
+                            bounds,
+                            seed if sketch else None,
+                        )
+                        merged = merge_partial_aggregates(f["rows"] for f in futures)
+                        row = {
+                            "variant": variant_key,
+                            "mode": mode,
+                            "workers": workers,
+                            "rows": int(merged["count"].to_numpy().sum()),
+                            "wall_seconds": wall,
+                            "extract_seconds": sum(f["extract_seconds"] for f in futures) / workers,
+                            "transform_seconds": sum(f["transform_seconds"] for f in futures) / workers,
+                            "workers_rss_mb": sum(f["rss"] for f in futures) / 1024,
+                            "workers_pss_mb": sum(f["pss"] for f in futures) / 1024,
+                            "shared_dataset_mb": shared.nbytes / 2**20 if mode == "shared" else 0,
+                        }
+                        if sketch:
+                            merged_sketch, merge_seconds = measure_seconds(
+                                merge_partial_sketches, (f["sketch"] for f in futures)
+                            )
+                            row["sketch_seconds"] = sum(f["sketch_seconds"] for f in futures) / workers
+                            row["sketch_merge_seconds"] = merge_seconds
+                            row["sketch_bytes"] = merged_sketch.nbytes
+                        results.append(row)
+    return results
+
+
+def pipeline_overlap(
+    formats: Iterable[str] = DEFAULT_PIPELINE_FORMATS,
+    queue_depths: Iterable[int] = DEFAULT_QUEUE_DEPTHS,
+    rows: int = settings.DEFAULT_ROWS,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    seed: int = settings.SEED,
+) -> List[dict]:
+    """
+    Compare sequential (depth 0) and prefetching reads per format, reporting
+    stall time on both sides of the queue and how much I/O the pipeline hides.
+    """
+    results: List[dict] = []
+    generator = DataGenerator(seed=seed)
+    queue_depths = list(queue_depths)
+
+    for fmt in formats:
+        dataset_path = settings.DATA_DIR / f"pipeline_{rows}.{EXTENSIONS[fmt]}"
+        if not dataset_path.exists():
+            console.print(
+                f"[yellow]Generating[/yellow] {rows:,} rows as {fmt} -> {dataset_path}"
+            )
+            generator.generate_and_save(rows, fmt=fmt, output_path=dataset_path)
+
+        # The sequential pass is the baseline for every depth, so run it first
+        # (even when depth 0 isn't requested) regardless of the order given,
+        # after one untimed pass to warm the page cache and first-call costs.
+        console.print(f"[bold green]Sequential baseline[/bold green] fmt={fmt}")
+        run_pipelined(dataset_path, fmt=fmt, queue_depth=0, batch_rows=batch_rows)
+        _, sequential = run_pipelined(
+            dataset_path, fmt=fmt, queue_depth=0, batch_rows=batch_rows
+        )
+        for depth in queue_depths:
+            if depth == 0:
+                stats = sequential
+            else:
+                console.print(
+                    f"[bold green]Pipelined read[/bold green] fmt={fmt} queue_depth={depth}"
+                )
+                _, stats = run_pipelined(
+                    dataset_path, fmt=fmt, queue_depth=depth, batch_rows=batch_rows
+                )
+            row = stats.as_dict()
+            row["speedup_vs_sequential"] = (
+                sequential.wall_seconds / stats.wall_seconds if stats.wall_seconds > 0 else None
+            )
+            row["throughput_rows_per_s"] = (
+                stats.rows / stats.wall_seconds if stats.wall_seconds > 0 else 0
+            )
+            results.append(row)
+    return results
+
+
+def _exact_sketch_targets(dataset_path: Path, quantiles: List[float]) -> tuple[dict, float]:
+    """Exact distinct users and quantiles per event type from DuckDB, plus query seconds."""
+    import duckdb
+
+    quantile_cols = ", ".join(f"quantile_cont(values, {q})" for q in quantiles)
+    query = f"""
+        SELECT event_types, COUNT(*), COUNT(DISTINCT user_ids), {quantile_cols}
+        FROM parquet_scan('{dataset_path.as_posix()}')
+        GROUP BY 1
+        ORDER BY 1
+    """
+    with duckdb.connect() as con:
+        rows, seconds = measure_seconds(lambda: con.execute(query).fetchall())
+    return {int(r[0]): r[1:] for r in rows}, seconds
+
+
+def sketch_accuracy(
+    rows: int = settings.DEFAULT_ROWS,
+    hll_precisions: Iterable[int] = DEFAULT_HLL_PRECISIONS,
+    kll_ks: Iterable[int] = DEFAULT_KLL_KS,
+    workers: int = 4,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    seed: int = settings.SEED,
+) -> List[dict]:
+    """
+    Compare HyperLogLog/KLL sketches against exact DuckDB results per event type.
+
+    Batches are dealt round-robin to `workers` independent sketches which are
+    then merged, so the reported error includes the cost of merging.
+    """
+    import pyarrow.parquet as pq
+
+    from src.sketches import DEFAULT_QUANTILES, SKETCH_COLUMNS, SketchAggregator, quantile_label
+
+    quantiles = list(DEFAULT_QUANTILES)
+    dataset_path = settings.DATA_DIR / f"sketch_{rows}.parquet"
+    if not dataset_path.exists():
+        console.print(f"[yellow]Generating[/yellow] {rows:,} rows -> {dataset_path}")
+        DataGenerator(seed=seed).generate_and_save(rows, fmt="parquet", output_path=dataset_path)
+
+    exact, exact_seconds = _exact_sketch_targets(dataset_path, quantiles)
+    table = pq.read_table(dataset_path, columns=["event_types", "values"])
+    event_types = table["event_types"].to_numpy()
+    values = table["values"].to_numpy()
+    sorted_values = {et: np.sort(values[event_types == et]) for et in exact}
+
+    results: List[dict] = []
+    for precision in hll_precisions:
+        for k in kll_ks:
+            console.print(
+                f"[bold green]Sketching[/bold green] hll_precision={precision} kll_k={k} workers={workers}"
+            )
+
+            def build() -> SketchAggregator:
+                parts = [
+                    SketchAggregator(precision, k, quantiles, seed=seed + i)
+                    for i in range(workers)
+                ]
+                for i, batch in enumerate(
+                    iter_batches(dataset_path, "parquet", batch_rows, SKETCH_COLUMNS)
+                ):
+                    parts[i % workers].update(batch)
+                return merge_partial_sketches(parts)
+
+            sketch, sketch_seconds = measure_seconds(build)
+            for approx in sketch.rows():
+                et = approx["event_type"]
+                count, distinct, *exact_quantiles = exact[et]
+                row = {
+                    "hll_precision": precision,
+                    "kll_k": k,
+                    "workers": workers,
+                    "event_type": et,
+                    "exact_distinct": distinct,
+                    "approx_distinct": approx["distinct_users"],
+                    "distinct_rel_error": abs(approx["distinct_users"] - distinct) / distinct,
+                }
+                group_values = sorted_values[et]
+                for q, exact_q in zip(quantiles, exact_quantiles):
+                    label = quantile_label(q)
+                    rank = np.searchsorted(group_values, approx[label], side="right") / count
+                    row[f"exact_{label}"] = exact_q
+                    row[f"approx_{label}"] = approx[label]
+                    row[f"{label}_rank_error"] = abs(rank - q)
+                hll, kll = sketch.groups[et]
+                row["sketch_bytes"] = hll.nbytes + kll.nbytes
+                row["exact_state_bytes"] = (distinct + count) * 8  # key set + all values
+                row["sketch_seconds"] = sketch_seconds
+                row["exact_seconds"] = exact_seconds
+                results.append(row)
+    return results
+
+
+def duckdb_storage(
+    rows_list: Iterable[int] = DEFAULT_DUCKDB_ROWS,
+    repeats: int = 5,
+    seed: int = settings.SEED,
+) -> List[dict]:
+    """
+    Compare DuckDB native-table scans with Parquet scans, and measure the
+    per-query overhead that reusing one configured connection removes.
+
+    Timings are the fastest of `repeats` runs; ingest is forced once per size.
+    """
+    import duckdb
+
+    from src import variant_e
+
+    results: List[dict] = []
+    generator = DataGenerator(seed=seed)
+
+    def fresh_connection_query(path: Path):
+        with duckdb.connect(config=variant_e.connection_config()) as con:
+            return variant_e.query_parquet(con, path)
+
+    try:
+        for rows in rows_list:
+            dataset_path = settings.DATA_DIR / f"duckdb_{rows}.parquet"
+            if not dataset_path.exists():
+                console.print(f"[yellow]Generating[/yellow] {rows:,} rows -> {dataset_path}")
+                generator.generate_and_save(rows, fmt="parquet", output_path=dataset_path)
+
+            console.print(f"[bold green]DuckDB storage[/bold green] rows={rows:,}")
+            # Open both connections first so ingest isn't charged for connection setup.
+            native_con = variant_e.get_connection(settings.DUCKDB_PATH)
+            memory_con = variant_e.get_connection()
+            table, ingest_seconds = measure_seconds(variant_e.ingest, dataset_path, force=True)
+
+            def best(func, *args) -> float:
+                return min(measure_seconds(func, *args)[1] for _ in range(repeats))
+
+            native_seconds = best(variant_e.query_native, native_con, table)
+            parquet_seconds = best(variant_e.query_parquet, memory_con, dataset_path)
+            fresh_seconds = best(fresh_connection_query, dataset_path)
+            results.append(
+                {
+                    "rows": rows,
+                    "ingest_seconds": ingest_seconds,
+                    "native_scan_seconds": native_seconds,
+                    "parquet_scan_seconds": parquet_seconds,
+                    "parquet_fresh_connection_seconds": fresh_seconds,
+                    "native_speedup_vs_parquet": parquet_seconds / native_seconds
+                    if native_seconds > 0
+                    else 0,
+                    "connection_overhead_seconds": fresh_seconds - parquet_seconds,
+                    "queries_to_amortize_ingest": ingest_seconds / (parquet_seconds - native_seconds)
+                    if parquet_seconds > native_seconds
+                    else None,
+                    "threads": settings.DUCKDB_THREADS or "default",
+                    "memory_limit": settings.DUCKDB_MEMORY_LIMIT or "default",
+                }
+            )
+    finally:
+        variant_e.close_connections()  # release the database file for other processes
+    return results
+
+
+def _memory_cap(limit_bytes: int, mode: str, cgroup_dir: Optional[Path]):
+    """preexec_fn that caps the child's memory before it execs the worker."""
+
+    def apply() -> None:
+        if mode == "rlimit":
+            resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+        else:
+            (cgroup_dir / "cgroup.procs").write_text(str(os.getpid()))
+
+    return apply
+
+
+def _make_cgroup(limit_bytes: int) -> Path:
+    if not (settings.CGROUP_ROOT / "cgroup.controllers").exists():
+        raise ValueError(
+            f"{settings.CGROUP_ROOT} is not a cgroup v2 mount; use --limit-mode rlimit"
+        )
+    cgroup_dir = settings.CGROUP_ROOT / f"micro_etl_{os.getpid()}"
+    try:
+        cgroup_dir.mkdir(exist_ok=True)
+        (cgroup_dir / "memory.max").write_text(str(limit_bytes))
+        swap_max = cgroup_dir / "memory.swap.max"
+        if swap_max.exists():
+            swap_max.write_text("0")
+    except OSError as exc:
+        raise ValueError(
+            f"Cannot create cgroup under {settings.CGROUP_ROOT} ({exc}); "
+            "use --limit-mode rlimit or run with a delegated cgroup v2 subtree"
+        ) from exc
+    return cgroup_dir
+
+
+def _classify_failure(returncode: int, stderr: str) -> tuple[str, str]:
+    """Return (status, most relevant stderr line) for a failed worker."""
+    lines = stderr.strip().splitlines()
+    for line in lines:
+        if any(marker.lower() in line.lower() for marker in OOM_MARKERS):
+            return "oom", line[:200]
+    detail = lines[-1][:200] if lines else f"exit code {returncode}"
+    if returncode == -9:
+        return "oom-killed", detail
+    return "error", detail
+
+
+def out_of_core(
+    variants: Iterable[str],
+    sizes_mb: Iterable[int] = DEFAULT_SCALING_SIZES_MB,
+    memory_limit_mb: int = 1024,
+    limit_mode: str = "rlimit",
+    timeout_s: float = 1800,
+    seed: int = settings.SEED,
+) -> List[dict]:
+    """
+    Run each variant in a memory-capped subprocess across growing dataset sizes.
+
+    `limit_mode` is "rlimit" (RLIMIT_AS on the child; also counts virtual
+    reservations, so it is stricter than RSS) or "cgroup" (cgroup v2
+    memory.max, needs a writable CGROUP_ROOT). DuckDB gets a memory_limit
+    below the cap and, like Polars, a spill directory whose peak size is
+    recorded. After a variant fails, its larger sizes are marked skipped.
+    """
+    if limit_mode not in {"rlimit", "cgroup"}:
+        raise ValueError(f"Unknown limit mode: {limit_mode}")
+    limit_bytes = memory_limit_mb * 1024 * 1024
+    cgroup_dir = _make_cgroup(limit_bytes) if limit_mode == "cgroup" else None
+    sizes_mb = sorted(sizes_mb)
+    generator = DataGenerator(seed=seed)
+    registry = get_registry()
+    results: List[dict] = []
+
+    try:
+        for variant_key in variants:
+            if variant_key not in registry:
+                console.print(f"[red]Skipping unknown variant {variant_key}[/red]")
+                continue
+            info = registry[variant_key]
+            fmt = info["default_format"]
+            failed_at: Optional[int] = None
+            for size_mb in sizes_mb:
+                rows = _rows_for_kb(size_mb * 1024)
+                row = {
+                    "variant": variant_key,
+                    "variant_name": info["name"],
+                    "size_mb": size_mb,
+                    "rows": rows,
+                    "memory_limit_mb": memory_limit_mb,
+                    "limit_mode": limit_mode,
+                    "status": "skipped",
+                    "seconds": None,
+                    "throughput_rows_per_s": None,
+                    "peak_rss_mb": None,
+                    "spill_bytes": None,
+                    "prepare_seconds": None,
+                    "error": f"failed at {failed_at}MB" if failed_at else "",
+                }
+                if failed_at is not None:
+                    results.append(row)
+                    continue
+
+                dataset_path = settings.DATA_DIR / f"scaling_{size_mb}mb.{EXTENSIONS[fmt]}"
+                if not dataset_path.exists():
+                    console.print(
+                        f"[yellow]Generating[/yellow] {rows:,} rows ({size_mb}MB target) -> {dataset_path}"
+                    )
+                    generator.generate_and_save(
+                        rows, fmt=fmt, output_path=dataset_path, chunk_rows=SCALING_CHUNK_ROWS
+                    )
+
+                console.print(
+                    f"[bold green]Running variant {variant_key.upper()}[/bold green] "
+                    f"size={size_mb}MB cap={memory_limit_mb}MB ({limit_mode})"
+                )
+                workdir = Path(tempfile.mkdtemp(prefix="micro_etl_scaling_"))
+                spill_dir = workdir / "spill"
+                spill_dir.mkdir()
+                env = {
+                    **os.environ,
+                    "SCALING_SPILL_DIR": str(spill_dir),
+                    "DUCKDB_TEMP_DIR": str(spill_dir),
+                    "DUCKDB_MEMORY_LIMIT": f"{int(memory_limit_mb * DUCKDB_LIMIT_FRACTION)}MB",
+                    "DUCKDB_PATH": str(workdir / "scaling.duckdb"),
+                    "POLARS_TEMP_DIR": str(spill_dir),
+                }
+                cmd = [sys.executable, "-m", "src.scaling_worker", variant_key, str(dataset_path)]
+                try:
+                    proc = subprocess.run(
+                        cmd,
+                        cwd=settings.BASE_DIR,
+                        env=env,
+                        capture_output=True,
+                        text=True,
+                        timeout=timeout_s,
+                        preexec_fn=_memory_cap(limit_bytes, limit_mode, cgroup_dir),
+                    )
+                except subprocess.TimeoutExpired:
+                    row.update(status="timeout", error=f"exceeded {timeout_s}s")
+                else:
+                    lines = proc.stdout.strip().splitlines()
+                    if proc.returncode == 0 and lines:
+                        metrics = json.loads(lines[-1])
+                        row.update(
+                            status="spilled" if metrics["spill_bytes"] else "ok",
+                            seconds=metrics["seconds"],
+                            throughput_rows_per_s=rows / metrics["seconds"]
+                            if metrics["seconds"] > 0
+                            else 0,
+                            peak_rss_mb=metrics["peak_rss_kb"] / 1024,
+                            spill_bytes=metrics["spill_bytes"],
+                            prepare_seconds=metrics["prepare_seconds"],
+                        )
+                    else:
+                        status, detail = _classify_failure(proc.returncode, proc.stderr)
+                        row.update(status=status, error=detail)
+                finally:
+                    shutil.rmtree(workdir, ignore_errors=True)
+
+                if row["status"] not in {"ok", "spilled"}:
+                    failed_at = size_mb
+                console.print(f"  status={row['status']} {row['error']}")
+                results.append(row)
+    finally:
+        if cgroup_dir is not None:
+            cgroup_dir.rmdir()
+    return results
+
+
+def join_sweep(
+    cardinalities: Iterable[int] = DEFAULT_JOIN_CARDINALITIES,
+    fact_rows: int = DEFAULT_JOIN_FACT_ROWS,
+    methods: Optional[Iterable[str]] = None,
+    repeats: int = 3,
+    seed: int = settings.SEED,
+) -> List[dict]:
+    """
+    Join-then-aggregate throughput as the user dimension grows.
+
+    Facts and dimension are generated in memory so only the join is timed.
+    `build_bytes` is the size of the build-side keys plus the joined column;
+    `build_fits_in` maps it onto this machine's cache levels.
+    """
+    import pyarrow as pa
+
+    caches = cache_sizes()
+    methods = list(methods or JOIN_REGISTRY.keys())
+    results: List[dict] = []
+
+    for cardinality in cardinalities:
+        generator = DataGenerator(seed=seed, user_cardinality=cardinality)
+        users = pa.table(generator.generate_users())
+        facts = pa.table(generator.generate_batch(fact_rows)).select(["user_ids", "values"])
+        build_bytes = users["user_ids"].nbytes + users["segment"].nbytes
+
+        for method in methods:
+            if method not in JOIN_REGISTRY:
+                console.print(f"[red]Skipping unknown join method {method}[/red]")
+                continue
+            handler = get_join_handler(method)
+            console.print(
+                f"[bold green]Join[/bold green] {method} users={cardinality:,} facts={fact_rows:,}"
+            )
+            duration = min(
+                measure_seconds(handler, facts, users)[1] for _ in range(repeats)
+            )
+            results.append(
+                {
+                    "method": method,
+                    "method_name": JOIN_REGISTRY[method]["name"],
+                    "user_cardinality": cardinality,
+                    "fact_rows": fact_rows,
+                    "build_bytes": build_bytes,
+                    "build_fits_in": fits_in_cache(build_bytes, caches),
+                    "seconds": duration,
+                    "throughput_rows_per_s": fact_rows / duration if duration > 0 else 0,
+                }
+            )
+    return results
+
+
+def layout_sweep(
+    sizes_kb: Iterable[int] = DEFAULT_LAYOUT_SIZES_KB,
+    layouts: Iterable[str] = layout.LAYOUTS,
+    orders: Iterable[str] = layout.ORDERS,
+    max_object_rows: int = MAX_OBJECT_ROWS,
+    seed: int = settings.SEED,
+) -> List[dict]:
+    """
+    Scan the same rows stored as AoS, SoA and `__slots__` objects, in
+    sequential and randomly permuted order, across working-set sizes.
+
+    The working set is the packed row-store size; `ns_per_row` against it
+    traces the memory-wall curve as data falls out of L1, L2 and L3.
+    """
+    caches = cache_sizes()
+    layouts = list(layouts)
+    orders = list(orders)
+    results: List[dict] = []
+
+    for size_kb in sizes_kb:
+        rows = layout.rows_for_bytes(size_kb * 1024)
+        include_objects = "objects" in layouts and rows <= max_object_rows
+        data, permutation = layout.build_layouts(rows, include_objects=include_objects, seed=seed)
+        random_order = layout.RandomOrder(permutation, data) if "random" in orders else None
+        for name in layouts:
+            if name not in data:
+                console.print(
+                    f"[yellow]Skipping[/yellow] {name} at {size_kb}KB ({rows:,} rows > {max_object_rows:,})"
+                )
+                continue
+            for order_name in orders:
+                order = random_order if order_name == "random" else None
+                console.print(
+                    f"[bold green]Layout[/bold green] {name} {order_name} size={size_kb}KB rows={rows:,}"
+                )
+                seconds = layout.time_scan(layout.SCANS[name], data[name], order)
+                results.append(
+                    {
+                        "layout": name,
+                        "order": order_name,
+                        "size_kb": size_kb,
+                        "rows": rows,
+                        "working_set_fits_in": fits_in_cache(size_kb * 1024, caches),
+                        "seconds": seconds,
+                        "ns_per_row": seconds / rows * 1e9,
+                        "throughput_rows_per_s": rows / seconds if seconds > 0 else 0,
+                    }
+                )
+        del data, permutation, random_order
+    return results
+
+
+def plot_layout_results(results: List[dict], output_path: Path) -> None:
+    """Plot ns/row versus working-set size per layout and order, marking cache sizes."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(9, 5))
+    series = sorted({(r["layout"], r["order"]) for r in results})
+    for name, order in series:
+        points = [r for r in results if r["layout"] == name and r["order"] == order]
+        ax.plot(
+            [r["size_kb"] * 1024 for r in points],
+            [r["ns_per_row"] for r in points],
+            marker="o",
+            linestyle="-" if order == "sequential" else "--",
+            label=f"{name} ({order})",
+        )
+    for level, size in sorted(cache_sizes().items()):
+        ax.axvline(size, color="grey", linewidth=0.8, linestyle=":")
+        ax.text(size, ax.get_ylim()[1], level, ha="right", va="top", fontsize=8)
+    ax.set_xscale("log", base=2)
+    ax.set_yscale("log")
+    ax.set_xlabel("Working set (bytes)")
+    ax.set_ylabel("ns per row")
+    ax.set_title("Memory wall: AoS vs SoA vs objects")
+    ax.legend(fontsize=8, loc="lower right")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(output_path, dpi=120, bbox_inches="tight")
+    plt.close(fig)
+
+
+def _default_startup_commands(workdir: Path) -> dict[str, list[str]]:
+    """
+    Default command set; each variant's input is generated here, once per
+    format, so the timed runs measure startup rather than data generation.
+    """
+    commands = {
+        "--help": ["--help"],
+        "info": ["info"],
+        "generate --format csv": [
+            "generate", "--rows", "1000", "--format", "csv",
+            "--output", str(workdir / "startup.csv"),
+        ],
+    }
+    generator = DataGenerator()
+    for key, info in get_registry().items():
+        fmt = info["default_format"]
+        input_path = workdir / f"startup_input.{EXTENSIONS[fmt]}"
+        if not input_path.exists():
+            generator.generate_and_save(1000, fmt=fmt, output_path=input_path)
+        commands[f"run --variant {key}"] = [
+            "run", "--variant", key, "--rows", "1000", "--input", str(input_path),
+        ]
+    return commands
+
+
+def _parse_importtime(stderr: str) -> tuple[float, set[str]]:
+    """Sum top-level cumulative import time (seconds) from `-X importtime` output."""
+    total_us = 0
+    packages: set[str] = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        packages.add(name.strip().split(".")[0])
+        if not name.startswith("  "):  # top-level import, not a nested one
+            total_us += int(cumulative)
+    return total_us / 1e6, packages
+
+
+def startup_costs(
+    commands: Optional[dict[str, list[str]]] = None,
+    repeats: int = 3,
+) -> List[dict]:
+    """
+    Measure cold-start cost per CLI command in fresh interpreters.
+
+    Each command runs `repeats` times under `python -X importtime -m src.main`;
+    the fastest wall time is kept, and the heavy libraries it imported are listed.
+    """
+    results: List[dict] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        commands = commands or _default_startup_commands(workdir)
+        env = {
+            **os.environ,
+            "PYTHONDONTWRITEBYTECODE": "1",
+            "DUCKDB_PATH": str(workdir / "startup.duckdb"),  # keep the user's database untouched
+        }
+        for label, args in commands.items():
+            best: Optional[dict] = None
+            for _ in range(repeats):
+                cmd = [sys.executable, "-X", "importtime", "-m", "src.main", *args]
+                proc, duration = measure_seconds(
+                    subprocess.run,
+                    cmd,
+                    cwd=settings.BASE_DIR,
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                )
+                if proc.returncode != 0:
+                    console.print(f"[red]Startup command failed:[/red] {label}")
+                    break
+                import_seconds, packages = _parse_importtime(proc.stderr)
+                if best is None or duration < best["wall_seconds"]:
+                    best = {
+                        "command": label,
+                        "wall_seconds": duration,
+                        "import_seconds": import_seconds,
+                        "heavy_modules": " ".join(
+                            m for m in HEAVY_MODULES if m in packages
+                        ),
+                    }
+            if best is not None:
+                results.append(best)
+    return results
+
+
 def write_results_csv(results: List[dict], output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     if not results:
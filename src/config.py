@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,8 +9,17 @@ class Settings(BaseSettings):
     OUTPUT_DIR: Path = BASE_DIR / "output"
     DEFAULT_ROWS: int = 1_000_000
     SEED: int = 42
+    PREFETCH_DEPTH: int = 2
+    PIPELINE_BATCH_ROWS: int = 200_000
+    DUCKDB_PATH: Optional[Path] = None  # defaults to DATA_DIR/micro_etl.duckdb
+    DUCKDB_THREADS: Optional[int] = None
+    DUCKDB_MEMORY_LIMIT: Optional[str] = None  # e.g. "2GB"
+    DUCKDB_TEMP_DIR: Optional[Path] = None  # where DuckDB spills past its memory limit
+    CGROUP_ROOT: Path = Path("/sys/fs/cgroup")  # cgroup v2 mount for memory-capped runs
     
     def model_post_init(self, __context):
+        if self.DUCKDB_PATH is None:
+            self.DUCKDB_PATH = self.DATA_DIR / "micro_etl.duckdb"
         self.DATA_DIR.mkdir(parents=True, exist_ok=True)
         self.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
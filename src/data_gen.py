@@ -11,6 +11,20 @@ import pyarrow.parquet as pq
 from src.config import settings
 
 SupportedFormat = Literal["binary", "parquet", "arrow", "csv", "jsonl"]
+KeySkew = Literal["uniform", "zipf", "hotspot"]
+ValueDistribution = Literal["normal", "uniform", "exponential", "lognormal"]
+
+USER_SEGMENTS = 16
+DEFAULT_EVENT_TYPES = 4
+MAX_KEY_CARDINALITY = 2**64
+
+
+def key_dtype(cardinality: int) -> np.dtype:
+    """Smallest unsigned dtype that holds keys in [0, cardinality)."""
+    for dtype in (np.uint16, np.uint32):
+        if cardinality - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
 
 
 class DataGenerator:
@@ -18,18 +32,120 @@ class DataGenerator:
     Synthetic dataset generator for cache-aware benchmarking.
     """
 
-    def __init__(self, seed: int = settings.SEED):
+    def __init__(
+        self,
+        seed: int = settings.SEED,
+        user_cardinality: int | None = None,
+        key_cardinality: int | None = None,
+        key_skew: KeySkew = "uniform",
+        zipf_exponent: float = 1.1,
+        hot_fraction: float = 0.9,
+        hot_keys: int = 16,
+        value_distribution: ValueDistribution = "normal",
+    ):
+        """
+        `user_cardinality` switches `user_ids` from the default [100, 9999)
+        range to [0, user_cardinality), matching `generate_users`.
+
+        The remaining options shape the group-by key `event_types`:
+        `key_cardinality` draws it from [0, N) for N up to 2**64 (default: 4
+        types); `key_skew` is "uniform", "zipf" (key k has weight
+        1 / (k + 1) ** zipf_exponent) or "hotspot" (`hot_fraction` of rows hit
+        the first `hot_keys` keys, the rest are uniform). `value_distribution`
+        picks how `values` are drawn.
+        """
+        if key_cardinality is not None and not 1 <= key_cardinality <= MAX_KEY_CARDINALITY:
+            raise ValueError("key_cardinality must be between 1 and 2**64")
+        if key_skew not in ("uniform", "zipf", "hotspot"):
+            raise ValueError(f"Unsupported key skew: {key_skew}")
+        if key_skew == "zipf" and zipf_exponent <= 0:
+            raise ValueError("zipf_exponent must be positive")
+        if key_skew == "hotspot" and not (0.0 <= hot_fraction <= 1.0 and hot_keys >= 1):
+            raise ValueError("hot_fraction must be in [0, 1] and hot_keys >= 1")
+        if value_distribution not in ("normal", "uniform", "exponential", "lognormal"):
+            raise ValueError(f"Unsupported value distribution: {value_distribution}")
         self.rng = np.random.default_rng(seed)
+        self.user_cardinality = user_cardinality
+        self.key_cardinality = key_cardinality
+        self.key_skew = key_skew
+        self.zipf_exponent = zipf_exponent
+        self.hot_fraction = hot_fraction
+        self.hot_keys = hot_keys
+        self.value_distribution = value_distribution
+
+    def distribution_tag(self) -> str:
+        """
+        Short filename suffix describing non-default key/value options, e.g.
+        "_k1000000_zipf1.1", so cached datasets with different shapes don't collide.
+        """
+        tag = ""
+        if self.key_cardinality is not None:
+            tag += f"_k{self.key_cardinality}"
+        if self.key_skew == "zipf":
+            tag += f"_zipf{self.zipf_exponent:g}"
+        elif self.key_skew == "hotspot":
+            tag += f"_hot{self.hot_fraction:g}x{self.hot_keys}"
+        if self.value_distribution != "normal":
+            tag += f"_{self.value_distribution}"
+        return tag
+
+    def _zipf_keys(self, n_rows: int, cardinality: int) -> np.ndarray:
+        """
+        Bounded Zipf ranks in [0, cardinality) by inverting the continuous
+        power-law CDF on [1, cardinality + 1). Vectorized and O(n_rows) for any
+        cardinality, at the cost of being approximate for the hottest ranks.
+        """
+        u = self.rng.random(n_rows)
+        upper = float(cardinality) + 1.0
+        s = self.zipf_exponent
+        if abs(s - 1.0) < 1e-9:
+            ranks = np.exp(u * np.log(upper))
+        else:
+            ranks = ((upper ** (1.0 - s) - 1.0) * u + 1.0) ** (1.0 / (1.0 - s))
+        keys = np.floor(ranks) - 1.0
+        # float64 cannot represent every uint64; clamp rounding at the top end
+        keys = np.clip(keys, 0.0, np.nextafter(float(cardinality), 0.0))
+        return keys.astype(np.uint64)
+
+    def _event_types(self, n_rows: int) -> np.ndarray:
+        cardinality = self.key_cardinality or DEFAULT_EVENT_TYPES
+        dtype = np.uint8 if cardinality <= 256 else key_dtype(cardinality)
+        if self.key_skew == "zipf":
+            return self._zipf_keys(n_rows, cardinality).astype(dtype)
+        keys = self.rng.integers(low=0, high=cardinality, size=n_rows, dtype=dtype)
+        if self.key_skew == "hotspot":
+            hot = self.rng.random(n_rows) < self.hot_fraction
+            keys[hot] = self.rng.integers(
+                low=0, high=min(self.hot_keys, cardinality), size=int(hot.sum()), dtype=dtype
+            )
+        return keys
+
+    def _values(self, n_rows: int) -> np.ndarray:
+        if self.value_distribution == "uniform":
+            return self.rng.uniform(-1.0, 1.0, size=n_rows)
+        if self.value_distribution == "exponential":
+            return self.rng.exponential(scale=1.0, size=n_rows)
+        if self.value_distribution == "lognormal":
+            return self.rng.lognormal(mean=0.0, sigma=1.0, size=n_rows)
+        return self.rng.standard_normal(size=n_rows).astype(np.float64)
 
-    def generate_batch(self, n_rows: int) -> dict[str, np.ndarray]:
-        """Generate a batch of synthetic data."""
-        event_id = np.arange(n_rows, dtype=np.uint64)
+    def generate_batch(self, n_rows: int, start_id: int = 0) -> dict[str, np.ndarray]:
+        """Generate a batch of synthetic data with event ids starting at `start_id`."""
+        event_id = np.arange(start_id, start_id + n_rows, dtype=np.uint64)
         timestamp = np.sort(
             self.rng.integers(low=0, high=10**9, size=n_rows, dtype=np.uint64)
         )
-        user_ids = self.rng.integers(low=100, high=9999, size=n_rows, dtype=np.uint16)
-        event_types = self.rng.integers(low=0, high=4, size=n_rows, dtype=np.uint8)
-        values = self.rng.standard_normal(size=n_rows).astype(np.float64)
+        if self.user_cardinality:
+            user_ids = self.rng.integers(
+                low=0,
+                high=self.user_cardinality,
+                size=n_rows,
+                dtype=key_dtype(self.user_cardinality),
+            )
+        else:
+            user_ids = self.rng.integers(low=100, high=9999, size=n_rows, dtype=np.uint16)
+        event_types = self._event_types(n_rows)
+        values = self._values(n_rows)
         metadata_samples: list[str] = [f'{{"info": "test_{i}"}}' for i in range(1000)]
         metadata_list: list[str] = (metadata_samples * (n_rows // 1000 + 1))[:n_rows]
         metadata = np.array(metadata_list, dtype=object)
@@ -42,6 +158,43 @@ class DataGenerator:
             "metadata": metadata,
         }
 
+    def generate_users(self, cardinality: int | None = None) -> dict[str, np.ndarray]:
+        """
+        Generate a user dimension table keyed by `user_ids` in [0, cardinality).
+
+        Keys are shuffled so the build side of a join arrives unsorted.
+        """
+        cardinality = cardinality or self.user_cardinality
+        if not cardinality:
+            raise ValueError("A user cardinality is required for the dimension table")
+        user_ids = self.rng.permutation(cardinality).astype(key_dtype(cardinality))
+        segment = self.rng.integers(low=0, high=USER_SEGMENTS, size=cardinality, dtype=np.uint8)
+        lifetime_value = self.rng.exponential(scale=100.0, size=cardinality)
+        return {
+            "user_ids": user_ids,
+            "segment": segment,
+            "lifetime_value": lifetime_value,
+        }
+
+    def save_users(
+        self,
+        fmt: SupportedFormat,
+        output_path: Path | None = None,
+        cardinality: int | None = None,
+    ) -> Path:
+        """Generate the user dimension table and persist it (parquet, arrow or csv)."""
+        data = self.generate_users(cardinality)
+        fmt = fmt.lower()
+        target = output_path or self._default_path(fmt, stem="users")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "parquet":
+            return self.save_as_parquet(data, target)
+        if fmt == "arrow":
+            return self.save_as_arrow(data, target)
+        if fmt == "csv":
+            return self.save_as_csv(data, target)
+        raise ValueError(f"Unsupported format for the user dimension: {fmt}")
+
     def _as_table(self, data: dict[str, np.ndarray]) -> pa.Table:
         """Convert the numpy dict to a PyArrow Table."""
         return pa.table(data)
@@ -60,6 +213,10 @@ class DataGenerator:
         """
 
         n_rows = len(next(iter(data.values())))
+        if n_rows and int(data["user_ids"].max()) > 0xFFFF:
+            raise ValueError("Binary format stores user_ids as uint16; lower the user cardinality")
+        if n_rows and int(data["event_types"].max()) > 0xFF:
+            raise ValueError("Binary format stores event_types as uint8; lower the key cardinality")
         with path.open("wb") as f:
             f.write(b"CETL1")
             f.write(struct.pack("<Q", n_rows))
@@ -105,17 +262,61 @@ class DataGenerator:
                 f.write(json.dumps(record) + "\n")
         return path
 
+    def save_chunked(
+        self, n_rows: int, fmt: str, path: Path, chunk_rows: int
+    ) -> Path:
+        """
+        Generate and write `n_rows` in chunks of `chunk_rows`, so datasets larger
+        than RAM can be produced. Timestamps are sorted within each chunk only.
+        """
+        chunks = (
+            self.generate_batch(min(chunk_rows, n_rows - start), start_id=start)
+            for start in range(0, n_rows, chunk_rows)
+        )
+        if fmt == "jsonl":
+            with path.open("w", encoding="utf-8") as f:
+                for data in chunks:
+                    n = len(data["event_id"])
+                    for i in range(n):
+                        record = {k: self._json_safe(v[i]) for k, v in data.items()}
+                        f.write(json.dumps(record) + "\n")
+            return path
+
+        if fmt not in {"parquet", "arrow", "csv"}:
+            raise ValueError(f"Chunked generation not supported for format: {fmt}")
+        first = self._as_table(next(chunks))
+        with pa.OSFile(str(path), "wb") as sink:
+            if fmt == "parquet":
+                writer = pq.ParquetWriter(sink, first.schema)
+            elif fmt == "arrow":
+                writer = pa.ipc.new_file(sink, first.schema)
+            else:
+                writer = pa_csv.CSVWriter(sink, first.schema)
+            with writer:
+                writer.write_table(first)
+                for data in chunks:
+                    writer.write_table(self._as_table(data))
+        return path
+
     def generate_and_save(
         self,
         n_rows: int,
         fmt: SupportedFormat,
         output_path: Path | None = None,
+        chunk_rows: int | None = None,
     ) -> Path:
-        """Generate a dataset and persist it in the requested format."""
-        data = self.generate_batch(n_rows)
+        """
+        Generate a dataset and persist it in the requested format.
+
+        With `chunk_rows`, rows are generated and written incrementally
+        (not supported for the binary format).
+        """
         fmt = fmt.lower()
         target = output_path or self._default_path(fmt)
         target.parent.mkdir(parents=True, exist_ok=True)
+        if chunk_rows and n_rows > chunk_rows and fmt != "binary":
+            return self.save_chunked(n_rows, fmt, target, chunk_rows)
+        data = self.generate_batch(n_rows)
         if fmt == "binary":
             return self.save_as_binary(data, target)
         if fmt == "parquet":
@@ -128,7 +329,7 @@ class DataGenerator:
             return self.save_as_jsonl(data, target)
         raise ValueError(f"Unsupported format: {fmt}")
 
-    def _default_path(self, fmt: str) -> Path:
+    def _default_path(self, fmt: str, stem: str = "synthetic") -> Path:
         ext_map = {
             "binary": "bin",
             "parquet": "parquet",
@@ -137,7 +338,7 @@ class DataGenerator:
             "jsonl": "jsonl",
         }
         ext = ext_map.get(fmt, fmt)
-        return settings.DATA_DIR / f"synthetic.{ext}"
+        return settings.DATA_DIR / f"{stem}.{ext}"
 
     @staticmethod
     def _json_safe(value) -> object:
@@ -0,0 +1,146 @@
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from src.config import settings
+
+LAYOUTS = ("aos", "soa", "objects")
+ORDERS = ("sequential", "random")
+MIN_TIMED_SECONDS = 0.05  # repeat tiny scans until timings are stable
+
+# Packed row-store record, same fields as DataGenerator.generate_batch minus metadata.
+ROW_DTYPE = np.dtype(
+    [
+        ("event_id", np.uint64),
+        ("timestamp", np.uint64),
+        ("user_ids", np.uint16),
+        ("event_types", np.uint8),
+        ("values", np.float64),
+    ],
+    align=False,
+)
+N_EVENT_TYPES = 4
+
+
+class Event:
+    """One row as a Python object; `__slots__` drops the per-instance dict."""
+
+    __slots__ = ("event_id", "timestamp", "user_ids", "event_types", "values")
+
+    def __init__(self, event_id, timestamp, user_ids, event_types, values):
+        self.event_id = event_id
+        self.timestamp = timestamp
+        self.user_ids = user_ids
+        self.event_types = event_types
+        self.values = values
+
+
+def rows_for_bytes(n_bytes: int) -> int:
+    """Rows whose packed records occupy `n_bytes` (the working-set size)."""
+    return max(1, n_bytes // ROW_DTYPE.itemsize)
+
+
+def build_aos(n_rows: int, rng: np.random.Generator) -> np.ndarray:
+    """Array of structs: one packed structured array, fields interleaved per row."""
+    rows = np.empty(n_rows, dtype=ROW_DTYPE)
+    rows["event_id"] = np.arange(n_rows, dtype=np.uint64)
+    rows["timestamp"] = np.sort(rng.integers(0, 10**9, size=n_rows, dtype=np.uint64))
+    rows["user_ids"] = rng.integers(100, 9999, size=n_rows, dtype=np.uint16)
+    rows["event_types"] = rng.integers(0, N_EVENT_TYPES, size=n_rows, dtype=np.uint8)
+    rows["values"] = rng.standard_normal(size=n_rows)
+    return rows
+
+
+def build_soa(aos: np.ndarray) -> dict[str, np.ndarray]:
+    """Struct of arrays: each field copied into its own contiguous column."""
+    return {name: np.ascontiguousarray(aos[name]) for name in ROW_DTYPE.names}
+
+
+def build_objects(aos: np.ndarray) -> list[Event]:
+    """One `Event` per row, allocated in row order."""
+    return [Event(*row) for row in aos.tolist()]
+
+
+class RandomOrder:
+    """
+    A row permutation plus the gather buffers the random-order scans write
+    into, built once outside the timed region so each scan measures the
+    access pattern rather than allocation. Gathers use mode="clip" (the
+    permutation is always in range) because mode="raise" buffers `out`.
+    """
+
+    def __init__(self, permutation: np.ndarray, layouts: dict[str, object]):
+        n_rows = len(permutation)
+        self.index = permutation
+        self.records = np.empty(n_rows, dtype=ROW_DTYPE) if "aos" in layouts else None
+        self.event_types = np.empty(n_rows, dtype=np.uint8) if "soa" in layouts else None
+        self.values = np.empty(n_rows, dtype=np.float64) if "soa" in layouts else None
+        self.positions = permutation.tolist() if "objects" in layouts else None
+
+
+def scan_aos(rows: np.ndarray, order: Optional[RandomOrder]) -> np.ndarray:
+    """Sum `values` by `event_types`; every field read drags the full record stride."""
+    if order is not None:
+        # Whole-record gather into a reused buffer; per-field gathers would miss twice.
+        rows = np.take(rows, order.index, out=order.records, mode="clip")
+    return np.bincount(rows["event_types"], weights=rows["values"], minlength=N_EVENT_TYPES)
+
+
+def scan_soa(columns: dict[str, np.ndarray], order: Optional[RandomOrder]) -> np.ndarray:
+    """Sum `values` by `event_types`, touching only the two columns needed."""
+    event_types, values = columns["event_types"], columns["values"]
+    if order is not None:
+        event_types = np.take(event_types, order.index, out=order.event_types, mode="clip")
+        values = np.take(values, order.index, out=order.values, mode="clip")
+    return np.bincount(event_types, weights=values, minlength=N_EVENT_TYPES)
+
+
+def scan_objects(events: list[Event], order: Optional[RandomOrder]) -> list[float]:
+    """Sum `values` by `event_types` by chasing one object pointer per row."""
+    sums = [0.0] * N_EVENT_TYPES
+    if order is None:
+        for event in events:
+            sums[event.event_types] += event.values
+    else:
+        for i in order.positions:
+            event = events[i]
+            sums[event.event_types] += event.values
+    return sums
+
+
+SCANS: dict[str, Callable] = {
+    "aos": scan_aos,
+    "soa": scan_soa,
+    "objects": scan_objects,
+}
+
+
+def time_scan(scan: Callable, data, order: Optional[RandomOrder]) -> float:
+    """
+    Seconds per scan, repeating short scans until MIN_TIMED_SECONDS elapse.
+    One untimed scan first faults in the gather buffers. Random-order AoS/SoA
+    scans still include the gather itself (a copy, no allocation); objects
+    iterate the permutation in place.
+    """
+    scan(data, order)
+    iterations = 0
+    start = time.perf_counter()
+    while True:
+        scan(data, order)
+        iterations += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIMED_SECONDS:
+            return elapsed / iterations
+
+
+def build_layouts(
+    n_rows: int, include_objects: bool = True, seed: int = settings.SEED
+) -> tuple[dict[str, object], np.ndarray]:
+    """Return the same rows in each layout, plus a random permutation of row order."""
+    rng = np.random.default_rng(seed)
+    aos = build_aos(n_rows, rng)
+    layouts: dict[str, object] = {"aos": aos, "soa": build_soa(aos)}
+    if include_objects:
+        layouts["objects"] = build_objects(aos)
+    return layouts, rng.permutation(n_rows)
@@ -5,10 +5,11 @@ import typer
 from rich.console import Console
 
 from src.config import settings
-from src import bench
-from src.data_gen import DataGenerator
 from src.profiling_utils import run_with_cprofile
-from src.variants_registry import EXTENSIONS, VARIANT_REGISTRY, VariantHandler
+from src.variants_registry import EXTENSIONS, VariantHandler, get_handler, get_registry
+
+# Heavy modules (numpy, pyarrow, pandas, polars, duckdb) are imported inside
+# the commands that need them so `info` and `--help` start quickly.
 
 # Initialize the Typer app and Rich console
 app = typer.Typer(
@@ -30,9 +31,29 @@ def info():
     console.print(f"[bold white]Data Directory:[/bold white]   {settings.DATA_DIR}")
     console.print(f"[bold white]Output Directory:[/bold white] {settings.OUTPUT_DIR}")
     console.print(f"[bold white]Default Rows:[/bold white]     {settings.DEFAULT_ROWS:,}")
+    console.print(f"[bold white]DuckDB Database:[/bold white]  {settings.DUCKDB_PATH}")
     console.print("-" * 40 + "\n")
 
 
+def _generator_options(
+    key_cardinality: Optional[int],
+    key_skew: str,
+    zipf_exponent: float,
+    hot_fraction: float,
+    hot_keys: int,
+    value_distribution: str,
+) -> dict:
+    """DataGenerator keyword arguments shared by `generate` and `sweep`."""
+    return {
+        "key_cardinality": key_cardinality,
+        "key_skew": key_skew.lower(),
+        "zipf_exponent": zipf_exponent,
+        "hot_fraction": hot_fraction,
+        "hot_keys": hot_keys,
+        "value_distribution": value_distribution.lower(),
+    }
+
+
 @app.command()
 def generate(
     rows: int = typer.Option(
@@ -58,22 +79,80 @@ def generate(
         "--seed",
         help="RNG seed for reproducible datasets.",
     ),
+    user_cardinality: Optional[int] = typer.Option(
+        None,
+        "--user-cardinality",
+        help="Draw user_ids from [0, N) and also write a user dimension table of N rows.",
+    ),
+    users_output: Optional[Path] = typer.Option(
+        None,
+        "--users-output",
+        help="Optional path for the user dimension; defaults to data/users.<ext>.",
+    ),
+    key_cardinality: Optional[int] = typer.Option(
+        None,
+        "--key-cardinality",
+        help="Draw the event_types group-by key from [0, N), N up to 2**64 (default: 4 types).",
+    ),
+    key_skew: str = typer.Option(
+        "uniform",
+        "--key-skew",
+        help="Key distribution: uniform, zipf or hotspot.",
+    ),
+    zipf_exponent: float = typer.Option(
+        1.1,
+        "--zipf-exponent",
+        help="Zipf exponent s for --key-skew zipf.",
+    ),
+    hot_fraction: float = typer.Option(
+        0.9,
+        "--hot-fraction",
+        help="Share of rows hitting the hot keys for --key-skew hotspot.",
+    ),
+    hot_keys: int = typer.Option(
+        16,
+        "--hot-keys",
+        help="Number of hot keys for --key-skew hotspot.",
+    ),
+    value_distribution: str = typer.Option(
+        "normal",
+        "--value-distribution",
+        help="Distribution of values: normal, uniform, exponential, lognormal.",
+    ),
 ):
     """
     Generate synthetic datasets for benchmarking.
     """
+    from src.data_gen import DataGenerator
+
     fmt = fmt.lower()
-    generator = DataGenerator(seed=seed)
+    try:
+        generator = DataGenerator(
+            seed=seed,
+            user_cardinality=user_cardinality,
+            **_generator_options(
+                key_cardinality, key_skew, zipf_exponent, hot_fraction, hot_keys, value_distribution
+            ),
+        )
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        raise typer.Exit(code=1)
     console.print(
         f"[bold green]Generating[/bold green] {rows:,} rows as [cyan]{fmt}[/cyan]..."
     )
     try:
         path = generator.generate_and_save(rows, fmt=fmt, output_path=output)
+        if user_cardinality:
+            users_path = generator.save_users(fmt, output_path=users_output)
     except ValueError as exc:
         console.print(f"[red]Error:[/red] {exc}")
         raise typer.Exit(code=1)
 
     console.print(f"[bold green]Success:[/bold green] wrote {rows:,} rows to {path}")
+    if user_cardinality:
+        console.print(
+            f"[bold green]Success:[/bold green] wrote {user_cardinality:,} users to {users_path}"
+        )
 
 
 @app.command()
@@ -82,7 +161,7 @@ def run(
         ...,
         "--variant",
         "-v",
-        help="Variant to run: a, b, c, d, e, f, g.",
+        help="Variant to run: a, b, c, d, e, f, g, h, i, j.",
     ),
     input_path: Optional[Path] = typer.Option(
         None,
@@ -129,14 +208,15 @@ def run(
     ),
 ):
     """
-    Run a specific ETL pipeline variant (A–G).
+    Run a specific ETL pipeline variant (A–J).
     """
     variant_key = variant.lower()
-    if variant_key not in VARIANT_REGISTRY:
+    registry = get_registry()
+    if variant_key not in registry:
         console.print(f"[red]Unknown variant: {variant}[/red]")
         raise typer.Exit(code=1)
 
-    variant_info = VARIANT_REGISTRY[variant_key]
+    variant_info = registry[variant_key]
     selected_format = (fmt.lower() if fmt else variant_info["default_format"])
     if selected_format not in variant_info["allowed_formats"]:
         console.print(
@@ -157,6 +237,8 @@ def run(
         console.print(
             f"[yellow]Auto-generating[/yellow] {rows:,} rows as {selected_format} at {dataset_path}"
         )
+        from src.data_gen import DataGenerator
+
         generator = DataGenerator(seed=seed)
         generator.generate_and_save(rows, fmt=selected_format, output_path=dataset_path)
 
@@ -164,15 +246,17 @@ def run(
         f"[bold green]Running variant {variant_key.upper()}[/bold green] "
         f"({variant_info['name']}) on {dataset_path}"
     )
-    handler: VariantHandler = variant_info["handler"]
+    handler: VariantHandler = get_handler(variant_key)
     if profile:
         stats_path = profile_output or settings.OUTPUT_DIR / f"profile_{variant_key}.prof"
         results = run_with_cprofile(handler, stats_path, dataset_path, output)
     else:
         results = handler(dataset_path, output)
 
+    from src.results import to_rows
+
     console.print("[bold green]Aggregation complete[/bold green]")
-    for row in results:
+    for row in to_rows(results):
         console.print(
             f"event_type={row['event_type']} count={row['count']} "
             f"sum={row['sum']:.4f} mean={row['mean']:.4f}"
@@ -204,12 +288,62 @@ def sweep(
         "-o",
         help="Path to write sweep results CSV.",
     ),
+    in_memory: bool = typer.Option(
+        False,
+        "--in-memory",
+        help="Decode each size once and time only the variants' transforms.",
+    ),
+    key_cardinality: Optional[int] = typer.Option(
+        None,
+        "--key-cardinality",
+        help="Draw the event_types group-by key from [0, N), N up to 2**64 (default: 4 types).",
+    ),
+    key_skew: str = typer.Option(
+        "uniform",
+        "--key-skew",
+        help="Key distribution: uniform, zipf or hotspot.",
+    ),
+    zipf_exponent: float = typer.Option(
+        1.1,
+        "--zipf-exponent",
+        help="Zipf exponent s for --key-skew zipf.",
+    ),
+    hot_fraction: float = typer.Option(
+        0.9,
+        "--hot-fraction",
+        help="Share of rows hitting the hot keys for --key-skew hotspot.",
+    ),
+    hot_keys: int = typer.Option(
+        16,
+        "--hot-keys",
+        help="Number of hot keys for --key-skew hotspot.",
+    ),
+    value_distribution: str = typer.Option(
+        "normal",
+        "--value-distribution",
+        help="Distribution of values: normal, uniform, exponential, lognormal.",
+    ),
 ):
     """
     Run a batch-size sweep across variants and working set sizes.
     """
-    variants = [v.lower() for v in variant] or list(VARIANT_REGISTRY.keys())
-    results = bench.sweep(variants=variants, sizes_kb=size_kb, seed=seed)
+    from src import bench
+
+    variants = [v.lower() for v in variant] or list(get_registry().keys())
+    options = _generator_options(
+        key_cardinality, key_skew, zipf_exponent, hot_fraction, hot_keys, value_distribution
+    )
+    try:
+        results = bench.sweep(
+            variants=variants,
+            sizes_kb=size_kb,
+            seed=seed,
+            in_memory=in_memory,
+            generator_options=options,
+        )
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        raise typer.Exit(code=1)
     if results:
         bench.write_results_csv(results, output)
         console.print(
@@ -219,5 +353,650 @@ def sweep(
         console.print("[yellow]No results produced.[/yellow]")
 
 
+@app.command()
+def pipeline(
+    fmt: List[str] = typer.Option(
+        [],
+        "--format",
+        "-f",
+        help="Formats to benchmark (repeatable): parquet, csv, jsonl. Defaults to all.",
+    ),
+    queue_depth: List[int] = typer.Option(
+        [],
+        "--queue-depth",
+        "-q",
+        min=0,
+        help="Prefetch queue depths (repeatable); 0 runs sequentially. Defaults to 0,1,2,4.",
+    ),
+    rows: int = typer.Option(
+        settings.DEFAULT_ROWS,
+        "--rows",
+        "-r",
+        help="Rows in each generated dataset.",
+    ),
+    batch_rows: int = typer.Option(
+        settings.PIPELINE_BATCH_ROWS,
+        "--batch-rows",
+        help="Rows per batch handed from the reader to the transform.",
+    ),
+    seed: int = typer.Option(
+        settings.SEED,
+        "--seed",
+        help="Seed for synthetic data generation.",
+    ),
+    output: Path = typer.Option(
+        settings.OUTPUT_DIR / "pipeline_results.csv",
+        "--output",
+        "-o",
+        help="Path to write pipeline overlap results CSV.",
+    ),
+):
+    """
+    Measure how much read time prefetching hides behind the transform.
+    """
+    from src import bench
+
+    formats = [f.lower() for f in fmt] or bench.DEFAULT_PIPELINE_FORMATS
+    unsupported = sorted(set(formats) - set(bench.DEFAULT_PIPELINE_FORMATS))
+    if unsupported:
+        console.print(f"[red]Unsupported format(s) for pipelining: {', '.join(unsupported)}[/red]")
+        raise typer.Exit(code=1)
+    depths = queue_depth or bench.DEFAULT_QUEUE_DEPTHS
+    results = bench.pipeline_overlap(
+        formats=formats,
+        queue_depths=depths,
+        rows=rows,
+        batch_rows=batch_rows,
+        seed=seed,
+    )
+    for row in results:
+        console.print(
+            f"fmt={row['fmt']} depth={row['queue_depth']} wall={row['wall_seconds']:.4f}s "
+            f"read={row['read_seconds']:.4f}s transform={row['transform_seconds']:.4f}s "
+            f"reader_stall={row['reader_stall_seconds']:.4f}s "
+            f"consumer_stall={row['consumer_stall_seconds']:.4f}s "
+            f"hidden_io={row['hidden_io_seconds']:.4f}s"
+        )
+    bench.write_results_csv(results, output)
+    console.print(
+        f"[bold green]Pipeline benchmark complete[/bold green]. Results written to {output}"
+    )
+
+
+@app.command()
+def sketch(
+    input_path: Path = typer.Option(
+        settings.DATA_DIR / "synthetic.parquet",
+        "--input",
+        "-i",
+        help="Parquet, CSV or JSONL dataset to sketch.",
+    ),
+    hll_precision: int = typer.Option(
+        12,
+        "--hll-precision",
+        help="HyperLogLog precision p (2**p registers).",
+    ),
+    kll_k: int = typer.Option(
+        200,
+        "--kll-k",
+        help="KLL accuracy parameter k.",
+    ),
+    queue_depth: int = typer.Option(
+        settings.PREFETCH_DEPTH,
+        "--queue-depth",
+        "-q",
+        min=0,
+        help="Prefetch queue depth for the streaming reader; 0 reads sequentially.",
+    ),
+):
+    """
+    Approximate distinct users and p50/p99 of values per event type in one streaming pass.
+    """
+    from src.pipeline import run_pipelined
+    from src.sketches import SketchAggregator
+
+    if not input_path.exists():
+        console.print(f"[red]Input file missing:[/red] {input_path}")
+        raise typer.Exit(code=1)
+    aggregator = SketchAggregator(hll_precision=hll_precision, kll_k=kll_k)
+    try:
+        results, stats = run_pipelined(input_path, queue_depth=queue_depth, aggregator=aggregator)
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        raise typer.Exit(code=1)
+
+    console.print(
+        f"[bold green]Sketching complete[/bold green] rows={stats.rows:,} "
+        f"sketch_bytes={aggregator.nbytes:,} wall={stats.wall_seconds:.4f}s"
+    )
+    for row in results.to_pylist():
+        console.print(
+            f"event_type={row['event_type']} count={row['count']} "
+            f"distinct_users~{row['distinct_users']:.0f} "
+            f"p50~{row['p50']:.4f} p99~{row['p99']:.4f}"
+        )
+
+
+@app.command("sketch-accuracy")
+def sketch_accuracy(
+    rows: int = typer.Option(
+        settings.DEFAULT_ROWS,
+        "--rows",
+        "-r",
+        help="Rows in the generated Parquet dataset.",
+    ),
+    hll_precision: List[int] = typer.Option(
+        [],
+        "--hll-precision",
+        help="HyperLogLog precisions to test (repeatable). Defaults to 8,10,12,14.",
+    ),
+    kll_k: List[int] = typer.Option(
+        [],
+        "--kll-k",
+        help="KLL k values to test (repeatable). Defaults to 50,100,200,400.",
+    ),
+    workers: int = typer.Option(
+        4,
+        "--workers",
+        help="Independent sketches merged at the end, simulating parallel workers.",
+    ),
+    seed: int = typer.Option(
+        settings.SEED,
+        "--seed",
+        help="Seed for synthetic data generation.",
+    ),
+    output: Path = typer.Option(
+        settings.OUTPUT_DIR / "sketch_accuracy.csv",
+        "--output",
+        "-o",
+        help="Path to write accuracy-versus-memory results CSV.",
+    ),
+):
+    """
+    Compare sketch accuracy and memory against exact DuckDB aggregates.
+    """
+    from src import bench
+
+    results = bench.sketch_accuracy(
+        rows=rows,
+        hll_precisions=hll_precision or bench.DEFAULT_HLL_PRECISIONS,
+        kll_ks=kll_k or bench.DEFAULT_KLL_KS,
+        workers=workers,
+        seed=seed,
+    )
+    bench.write_results_csv(results, output)
+    console.print(
+        f"[bold green]Sketch accuracy benchmark complete[/bold green]. Results written to {output}"
+    )
+
+
+@app.command("duckdb-storage")
+def duckdb_storage(
+    rows: List[int] = typer.Option(
+        [],
+        "--rows",
+        "-r",
+        help="Dataset sizes in rows (repeatable). Defaults to 100k, 1M, 5M.",
+    ),
+    repeats: int = typer.Option(
+        5,
+        "--repeats",
+        help="Query repetitions per measurement; the fastest is reported.",
+    ),
+    seed: int = typer.Option(
+        settings.SEED,
+        "--seed",
+        help="Seed for synthetic data generation.",
+    ),
+    output: Path = typer.Option(
+        settings.OUTPUT_DIR / "duckdb_storage.csv",
+        "--output",
+        "-o",
+        help="Path to write DuckDB storage results CSV.",
+    ),
+):
+    """
+    Compare DuckDB native-table and Parquet scans, with and without connection reuse.
+    """
+    from src import bench
+
+    results = bench.duckdb_storage(
+        rows_list=rows or bench.DEFAULT_DUCKDB_ROWS, repeats=repeats, seed=seed
+    )
+    for row in results:
+        console.print(
+            f"rows={row['rows']:,} ingest={row['ingest_seconds']:.4f}s "
+            f"native={row['native_scan_seconds']:.4f}s parquet={row['parquet_scan_seconds']:.4f}s "
+            f"fresh_conn={row['parquet_fresh_connection_seconds']:.4f}s"
+        )
+    bench.write_results_csv(results, output)
+    console.print(
+        f"[bold green]DuckDB storage benchmark complete[/bold green]. Results written to {output}"
+    )
+
+
+@app.command()
+def scale(
+    variant: List[str] = typer.Option(
+        [],
+        "--variant",
+        "-v",
+        help="Variants to include (repeatable). Defaults to all.",
+    ),
+    size_mb: List[int] = typer.Option(
+        [],
+        "--size-mb",
+        "-s",
+        help="Dataset sizes (MB of in-memory rows) to run (repeatable). Defaults to 16,128,1024,4096.",
+    ),
+    memory_limit_mb: int = typer.Option(
+        1024,
+        "--memory-limit-mb",
+        "-m",
+        help="Memory cap for each variant subprocess.",
+    ),
+    limit_mode: str = typer.Option(
+        "rlimit",
+        "--limit-mode",
+        help="How to enforce the cap: rlimit (RLIMIT_AS) or cgroup (cgroup v2 memory.max).",
+    ),
+    timeout_s: float = typer.Option(
+        1800,
+        "--timeout",
+        help="Per-run timeout in seconds.",
+    ),
+    seed: int = typer.Option(
+        settings.SEED,
+        "--seed",
+        help="Seed for synthetic data generation.",
+    ),
+    output: Path = typer.Option(
+        settings.OUTPUT_DIR / "scaling_results.csv",
+        "--output",
+        "-o",
+        help="Path to write scaling results CSV.",
+    ),
+):
+    """
+    Out-of-core scaling: run variants under a memory cap on growing datasets.
+    """
+    from src import bench
+
+    variants = [v.lower() for v in variant] or list(get_registry().keys())
+    try:
+        results = bench.out_of_core(
+            variants=variants,
+            sizes_mb=size_mb or bench.DEFAULT_SCALING_SIZES_MB,
+            memory_limit_mb=memory_limit_mb,
+            limit_mode=limit_mode.lower(),
+            timeout_s=timeout_s,
+            seed=seed,
+        )
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        raise typer.Exit(code=1)
+    bench.write_results_csv(results, output)
+    console.print(
+        f"[bold green]Scaling benchmark complete[/bold green]. Results written to {output}"
+    )
+
+
+@app.command("join-sweep")
+def join_sweep(
+    method: List[str] = typer.Option(
+        [],
+        "--method",
+        "-m",
+        help="Join methods to include (repeatable), e.g. a-dict, b-sorted-probe, e-hash. Defaults to all.",
+    ),
+    cardinality: List[int] = typer.Option(
+        [],
+        "--cardinality",
+        "-c",
+        help="User dimension sizes (repeatable). Defaults to 1k..10M.",
+    ),
+    fact_rows: int = typer.Option(
+        2_000_000,
+        "--fact-rows",
+        help="Fact rows probed against the dimension at each size.",
+    ),
+    repeats: int = typer.Option(
+        3,
+        "--repeats",
+        help="Runs per measurement; the fastest is reported.",
+    ),
+    seed: int = typer.Option(
+        settings.SEED,
+        "--seed",
+        help="Seed for synthetic data generation.",
+    ),
+    output: Path = typer.Option(
+        settings.OUTPUT_DIR / "join_sweep.csv",
+        "--output",
+        "-o",
+        help="Path to write join sweep results CSV.",
+    ),
+):
+    """
+    Join-then-aggregate throughput as the build-side table outgrows L2 and L3.
+    """
+    from src import bench
+    from src.profiling_utils import cache_sizes
+
+    caches = ", ".join(f"{level}={size // 1024}KB" for level, size in sorted(cache_sizes().items()))
+    console.print(f"[bold white]CPU caches:[/bold white] {caches}")
+    results = bench.join_sweep(
+        cardinalities=cardinality or bench.DEFAULT_JOIN_CARDINALITIES,
+        fact_rows=fact_rows,
+        methods=[m.lower() for m in method] or None,
+        repeats=repeats,
+        seed=seed,
+    )
+    bench.write_results_csv(results, output)
+    console.print(
+        f"[bold green]Join sweep complete[/bold green]. Results written to {output}"
+    )
+
+
+@app.command()
+def layout(
+    size_kb: List[int] = typer.Option(
+        [],
+        "--size-kb",
+        "-s",
+        help="Working-set sizes (KB) to sweep (repeatable). Defaults to 16KB..1GB.",
+    ),
+    layout_name: List[str] = typer.Option(
+        [],
+        "--layout",
+        "-l",
+        help="Layouts to include (repeatable): aos, soa, objects. Defaults to all.",
+    ),
+    max_object_rows: Optional[int] = typer.Option(
+        None,
+        "--max-object-rows",
+        help="Skip the Python-object layout above this many rows. Defaults to 5,000,000.",
+    ),
+    seed: int = typer.Option(
+        settings.SEED,
+        "--seed",
+        help="Seed for synthetic data generation.",
+    ),
+    output: Path = typer.Option(
+        settings.OUTPUT_DIR / "layout_results.csv",
+        "--output",
+        "-o",
+        help="Path to write layout results CSV.",
+    ),
+    plot: Optional[Path] = typer.Option(
+        None,
+        "--plot",
+        help="Optional PNG path for the memory-wall plot (needs matplotlib).",
+    ),
+):
+    """
+    Memory-layout experiment: AoS vs SoA vs Python objects, sequential vs random order.
+    """
+    from src import bench
+    from src.layout import LAYOUTS
+
+    layouts = [name.lower() for name in layout_name] or list(LAYOUTS)
+    unknown = sorted(set(layouts) - set(LAYOUTS))
+    if unknown:
+        console.print(f"[red]Unknown layout(s): {', '.join(unknown)}[/red]")
+        raise typer.Exit(code=1)
+    results = bench.layout_sweep(
+        sizes_kb=size_kb or bench.DEFAULT_LAYOUT_SIZES_KB,
+        layouts=layouts,
+        max_object_rows=bench.MAX_OBJECT_ROWS if max_object_rows is None else max_object_rows,
+        seed=seed,
+    )
+    bench.write_results_csv(results, output)
+    console.print(
+        f"[bold green]Layout sweep complete[/bold green]. Results written to {output}"
+    )
+    if plot:
+        try:
+            bench.plot_layout_results(results, plot)
+        except ImportError:
+            console.print("[red]matplotlib is required for --plot[/red]")
+            raise typer.Exit(code=1)
+        console.print(f"[bold green]Plot written[/bold green] to {plot}")
+
+
+@app.command()
+def skew(
+    variant: List[str] = typer.Option(
+        [],
+        "--variant",
+        "-v",
+        help="Variants to include (repeatable). Defaults to all with an in-memory mode.",
+    ),
+    cardinality: List[int] = typer.Option(
+        [],
+        "--cardinality",
+        "-k",
+        help="event_types cardinalities (repeatable). Defaults to 4, 1e3, 1e6, 2**64.",
+    ),
+    key_skew: List[str] = typer.Option(
+        [],
+        "--key-skew",
+        help="Key skews (repeatable): uniform, zipf, hotspot. Defaults to all three.",
+    ),
+    rows: int = typer.Option(
+        settings.DEFAULT_ROWS,
+        "--rows",
+        "-r",
+        help="Rows per dataset.",
+    ),
+    zipf_exponent: float = typer.Option(
+        1.1,
+        "--zipf-exponent",
+        help="Zipf exponent s for the zipf datasets.",
+    ),
+    hot_fraction: float = typer.Option(
+        0.9,
+        "--hot-fraction",
+        help="Share of rows hitting the hot keys in the hotspot datasets.",
+    ),
+    repeats: int = typer.Option(
+        3,
+        "--repeats",
+        min=1,
+        help="Runs per measurement after a warm-up; the fastest is reported.",
+    ),
+    seed: int = typer.Option(
+        settings.SEED,
+        "--seed",
+        help="Seed for synthetic data generation.",
+    ),
+    output: Path = typer.Option(
+        settings.OUTPUT_DIR / "skew_results.csv",
+        "--output",
+        "-o",
+        help="Path to write group-by skew results CSV.",
+    ),
+):
+    """
+    Group-by throughput per variant as key cardinality and skew grow.
+    """
+    from src import bench
+
+    variants = [v.lower() for v in variant] or list(get_registry().keys())
+    try:
+        results = bench.skew_sweep(
+            variants=variants,
+            cardinalities=cardinality or bench.DEFAULT_SKEW_CARDINALITIES,
+            skews=[s.lower() for s in key_skew] or bench.DEFAULT_SKEWS,
+            rows=rows,
+            seed=seed,
+            zipf_exponent=zipf_exponent,
+            hot_fraction=hot_fraction,
+            repeats=repeats,
+        )
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        raise typer.Exit(code=1)
+    for row in results:
+        console.print(
+            f"variant={row['variant']} k={row['key_cardinality']:<20} skew={row['skew']:<8} "
+            f"distinct={row['distinct_keys']:>9,} {row['throughput_rows_per_s']:>14,.0f} rows/s "
+            f"({row['relative_throughput']:.2f}x)"
+        )
+    bench.write_results_csv(results, output)
+    console.print(f"[bold green]Skew sweep complete[/bold green]. Results written to {output}")
+
+
+@app.command()
+def materialize(
+    variant: List[str] = typer.Option(
+        [],
+        "--variant",
+        "-v",
+        help="Variants to include (repeatable). Defaults to all with an in-memory mode.",
+    ),
+    cardinality: List[int] = typer.Option(
+        [],
+        "--cardinality",
+        "-k",
+        help="event_types cardinalities, i.e. output groups (repeatable). Defaults to 4, 1e4, 1e6.",
+    ),
+    rows: int = typer.Option(
+        settings.DEFAULT_ROWS,
+        "--rows",
+        "-r",
+        help="Rows per dataset.",
+    ),
+    seed: int = typer.Option(
+        settings.SEED,
+        "--seed",
+        help="Seed for synthetic data generation.",
+    ),
+    output: Path = typer.Option(
+        settings.OUTPUT_DIR / "materialize_results.csv",
+        "--output",
+        "-o",
+        help="Path to write result materialization CSV.",
+    ),
+):
+    """
+    Per-variant cost of converting Arrow results to Python dicts as output groups grow.
+    """
+    from src import bench
+
+    variants = [v.lower() for v in variant] or list(get_registry().keys())
+    results = bench.result_materialization(
+        variants=variants,
+        cardinalities=cardinality or bench.DEFAULT_RESULT_CARDINALITIES,
+        rows=rows,
+        seed=seed,
+    )
+    for row in results:
+        console.print(
+            f"variant={row['variant']} groups={row['result_rows']:>9,} "
+            f"transform={row['transform_seconds']:.4f}s to_rows={row['to_rows_seconds']:.4f}s "
+            f"({row['materialize_share']:.0%} of total)"
+        )
+    bench.write_results_csv(results, output)
+    console.print(
+        f"[bold green]Materialization benchmark complete[/bold green]. Results written to {output}"
+    )
+
+
+@app.command()
+def parallel(
+    variant: List[str] = typer.Option(
+        [],
+        "--variant",
+        "-v",
+        help="Variants to include (repeatable). Defaults to all with an in-memory mode.",
+    ),
+    rows: int = typer.Option(
+        settings.DEFAULT_ROWS,
+        "--rows",
+        "-r",
+        help="Rows in the shared dataset.",
+    ),
+    workers: List[int] = typer.Option(
+        [],
+        "--workers",
+        "-w",
+        help="Worker counts (repeatable). Defaults to 1,2,4,8.",
+    ),
+    sketch: bool = typer.Option(
+        False,
+        "--sketch",
+        help="Also build per-partition HLL/KLL sketches and merge them with the partial aggregates.",
+    ),
+    seed: int = typer.Option(
+        settings.SEED,
+        "--seed",
+        help="Seed for synthetic data generation.",
+    ),
+    output: Path = typer.Option(
+        settings.OUTPUT_DIR / "parallel_results.csv",
+        "--output",
+        "-o",
+        help="Path to write parallel transform results CSV.",
+    ),
+):
+    """
+    Process-parallel transforms: per-worker file decoding vs one shared-memory dataset.
+    """
+    from src import bench
+
+    variants = [v.lower() for v in variant] or list(get_registry().keys())
+    results = bench.parallel_transform(
+        variants=variants,
+        rows=rows,
+        workers_list=workers or bench.DEFAULT_PARALLEL_WORKERS,
+        seed=seed,
+        sketch=sketch,
+    )
+    for row in results:
+        console.print(
+            f"variant={row['variant']} mode={row['mode']:<6} workers={row['workers']} "
+            f"wall={row['wall_seconds']:.4f}s extract={row['extract_seconds']:.4f}s "
+            f"pss={row['workers_pss_mb']:.1f}MB"
+            + (f" sketch={row['sketch_seconds']:.4f}s" if sketch else "")
+        )
+    bench.write_results_csv(results, output)
+    console.print(
+        f"[bold green]Parallel benchmark complete[/bold green]. Results written to {output}"
+    )
+
+
+@app.command()
+def startup(
+    repeats: int = typer.Option(
+        3,
+        "--repeats",
+        help="Fresh-interpreter runs per command; the fastest is reported.",
+    ),
+    output: Path = typer.Option(
+        settings.OUTPUT_DIR / "startup_results.csv",
+        "--output",
+        "-o",
+        help="Path to write startup cost results CSV.",
+    ),
+):
+    """
+    Measure cold-start wall time and import cost for each CLI command.
+    """
+    from src import bench
+
+    results = bench.startup_costs(repeats=repeats)
+    for row in results:
+        console.print(
+            f"{row['command']:<24} wall={row['wall_seconds']:.3f}s "
+            f"imports={row['import_seconds']:.3f}s "
+            f"heavy=({row['heavy_modules'] or '-'})"
+        )
+    bench.write_results_csv(results, output)
+    console.print(
+        f"[bold green]Startup benchmark complete[/bold green]. Results written to {output}"
+    )
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,319 @@
+import io
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Protocol, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+from src.config import settings
+from src.results import result_table
+
+DEFAULT_BATCH_ROWS = settings.PIPELINE_BATCH_ROWS
+EST_CSV_BYTES_PER_ROW = 64  # used to size CSV read blocks to roughly `batch_rows`
+COLUMNS = ["event_types", "values"]
+# Key columns may hold uint64 values above the int64 range, which CSV/JSON
+# type inference would silently turn into doubles.
+KEY_TYPES = {"event_types": pa.uint64(), "user_ids": pa.uint64()}
+DENSE_KEY_LIMIT = 1 << 20  # largest key the bincount fast path will allocate for
+
+_SENTINEL = object()
+
+
+@dataclass
+class PipelineStats:
+    """Timing breakdown for one pipelined (or sequential) pass over a dataset."""
+
+    fmt: str
+    queue_depth: int
+    batches: int = 0
+    rows: int = 0
+    wall_seconds: float = 0.0
+    read_seconds: float = 0.0
+    transform_seconds: float = 0.0
+    reader_stall_seconds: float = 0.0  # reader blocked on a full queue
+    consumer_stall_seconds: float = 0.0  # transform blocked on an empty queue
+
+    @property
+    def hidden_io_seconds(self) -> float:
+        """Read time that overlapped with compute instead of blocking it."""
+        if self.queue_depth == 0:
+            return 0.0
+        return max(0.0, self.read_seconds - self.consumer_stall_seconds)
+
+    def as_dict(self) -> dict:
+        row = asdict(self)
+        row["hidden_io_seconds"] = self.hidden_io_seconds
+        row["hidden_io_fraction"] = (
+            self.hidden_io_seconds / self.read_seconds if self.read_seconds > 0 else 0.0
+        )
+        return row
+
+
+def format_for_path(path: Path) -> str:
+    """Infer the reader format from a dataset's file extension."""
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix in {"parquet", "csv", "jsonl"}:
+        return suffix
+    raise ValueError(f"Unsupported format for pipelined reads: {path.suffix}")
+
+
+def _iter_parquet(
+    path: Path, batch_rows: int, columns: Sequence[str]
+) -> Iterator[pa.RecordBatch]:
+    parquet_file = pq.ParquetFile(path)
+    yield from parquet_file.iter_batches(batch_size=batch_rows, columns=list(columns))
+
+
+def _iter_csv(
+    path: Path, batch_rows: int, columns: Sequence[str]
+) -> Iterator[pa.RecordBatch]:
+    read_options = pa_csv.ReadOptions(
+        block_size=max(1 << 16, batch_rows * EST_CSV_BYTES_PER_ROW),
+        use_threads=False,
+    )
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=list(columns),
+        column_types={name: KEY_TYPES[name] for name in columns if name in KEY_TYPES},
+    )
+    with pa_csv.open_csv(
+        path, read_options=read_options, convert_options=convert_options
+    ) as reader:
+        yield from reader
+
+
+def _iter_jsonl(
+    path: Path, batch_rows: int, columns: Sequence[str]
+) -> Iterator[pa.RecordBatch]:
+    parse_options = pa_json.ParseOptions(
+        explicit_schema=pa.schema([(name, KEY_TYPES[name]) for name in columns if name in KEY_TYPES])
+    )
+    with path.open("rb") as f:
+        while True:
+            lines = [line for _, line in zip(range(batch_rows), f)]
+            if not lines:
+                return
+            table = pa_json.read_json(
+                io.BytesIO(b"".join(lines)), parse_options=parse_options
+            ).select(list(columns))
+            yield from table.to_batches()
+
+
+_READERS: dict[str, Callable[[Path, int, Sequence[str]], Iterator[pa.RecordBatch]]] = {
+    "parquet": _iter_parquet,
+    "csv": _iter_csv,
+    "jsonl": _iter_jsonl,
+}
+
+
+def iter_batches(
+    path: Path,
+    fmt: Optional[str] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    columns: Sequence[str] = COLUMNS,
+) -> Iterator[pa.RecordBatch]:
+    """Stream record batches of `columns` from a Parquet, CSV or JSONL file."""
+    fmt = fmt or format_for_path(path)
+    if fmt not in _READERS:
+        raise ValueError(f"Unsupported format for pipelined reads: {fmt}")
+    return _READERS[fmt](path, batch_rows, columns)
+
+
+class PrefetchReader:
+    """
+    Background thread that pulls batches from a reader into a bounded queue.
+
+    The queue bounds how far the reader may run ahead of the transform, so
+    memory stays at roughly `queue_depth + 1` batches regardless of file size.
+    """
+
+    def __init__(self, batches: Iterator[pa.RecordBatch], queue_depth: int):
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be >= 1 for prefetching")
+        self._batches = batches
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self.read_seconds = 0.0
+        self.stall_seconds = 0.0
+
+    def _put(self, item) -> bool:
+        start = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                self.stall_seconds += time.perf_counter() - start
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self) -> None:
+        try:
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                batch = next(self._batches, _SENTINEL)
+                self.read_seconds += time.perf_counter() - start
+                if batch is _SENTINEL:
+                    break
+                if not self._put(batch):
+                    return
+        except BaseException as exc:  # surfaced to the consumer thread
+            self._put(exc)
+            return
+        self._put(_SENTINEL)
+
+    def __enter__(self) -> "PrefetchReader":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def __iter__(self) -> Iterator[pa.RecordBatch]:
+        while True:
+            item = self._queue.get()
+            if item is _SENTINEL:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+
+class BatchAggregator(Protocol):
+    """Transform stage of the pipeline: folds record batches into a result table."""
+
+    columns: Sequence[str]
+
+    def update(self, batch: pa.RecordBatch) -> None: ...
+
+    def result(self) -> pa.Table: ...
+
+
+class _GroupByAggregator:
+    """
+    Running count/sum of `values` grouped by non-negative `event_types`.
+
+    Small keys go through a dense `bincount` table indexed by key. The first
+    batch with a key at or above DENSE_KEY_LIMIT switches to sorted unique
+    keys, merged with each batch's partial aggregates via `np.unique`.
+    """
+
+    columns = COLUMNS
+
+    def __init__(self):
+        self.keys: Optional[np.ndarray] = None  # None while dense
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.sums = np.zeros(0, dtype=np.float64)
+
+    def update(self, batch: pa.RecordBatch) -> None:
+        event_types = batch.column("event_types").to_numpy(zero_copy_only=False)
+        values = batch.column("values").to_numpy(zero_copy_only=False)
+        if len(event_types) == 0:
+            return
+        if self.keys is None and int(event_types.max()) < DENSE_KEY_LIMIT:
+            self._update_dense(event_types.astype(np.intp), values)
+            return
+        if self.keys is None:
+            self.keys = np.flatnonzero(self.counts).astype(np.uint64)
+            self.counts, self.sums = self.counts[self.keys], self.sums[self.keys]
+        keys, inverse = np.unique(event_types, return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=values)
+        merged_keys, merged_inverse = np.unique(
+            np.concatenate([self.keys, keys.astype(np.uint64)]), return_inverse=True
+        )
+        self.counts = np.bincount(
+            merged_inverse, weights=np.concatenate([self.counts, counts])
+        ).astype(np.int64)
+        self.sums = np.bincount(merged_inverse, weights=np.concatenate([self.sums, sums]))
+        self.keys = merged_keys
+
+    def _update_dense(self, event_types: np.ndarray, values: np.ndarray) -> None:
+        counts = np.bincount(event_types)
+        sums = np.bincount(event_types, weights=values)
+        if len(counts) > len(self.counts):
+            self.counts = np.pad(self.counts, (0, len(counts) - len(self.counts)))
+            self.sums = np.pad(self.sums, (0, len(sums) - len(self.sums)))
+        self.counts[: len(counts)] += counts
+        self.sums[: len(sums)] += sums
+
+    def result(self) -> pa.Table:
+        if self.keys is None:
+            keys = np.flatnonzero(self.counts)
+            return result_table(keys, self.counts[keys], self.sums[keys])
+        return result_table(self.keys, self.counts, self.sums)
+
+
+def run_pipelined(
+    input_path: Path,
+    fmt: Optional[str] = None,
+    queue_depth: int = settings.PREFETCH_DEPTH,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    aggregator: Optional[BatchAggregator] = None,
+) -> tuple[pa.Table, PipelineStats]:
+    """
+    Aggregate count/sum/mean of `values` by `event_types`, overlapping reads
+    of batch N+1..N+depth with the transform of batch N.
+
+    `queue_depth=0` runs the same reader and transform strictly sequentially,
+    which is the baseline the hidden I/O time is measured against. Passing an
+    `aggregator` swaps the transform (e.g. for streaming sketches) while
+    keeping the same readers and instrumentation.
+    """
+    fmt = fmt or format_for_path(input_path)
+    stats = PipelineStats(fmt=fmt, queue_depth=queue_depth)
+    aggregator = aggregator or _GroupByAggregator()
+    batches = iter_batches(input_path, fmt, batch_rows, aggregator.columns)
+
+    wall_start = time.perf_counter()
+    if queue_depth == 0:
+        while True:
+            start = time.perf_counter()
+            batch = next(batches, None)
+            stats.read_seconds += time.perf_counter() - start
+            if batch is None:
+                break
+            start = time.perf_counter()
+            aggregator.update(batch)
+            stats.transform_seconds += time.perf_counter() - start
+            stats.batches += 1
+            stats.rows += batch.num_rows
+    else:
+        with PrefetchReader(batches, queue_depth) as reader:
+            stream = iter(reader)
+            while True:
+                start = time.perf_counter()
+                batch = next(stream, None)
+                stats.consumer_stall_seconds += time.perf_counter() - start
+                if batch is None:
+                    break
+                start = time.perf_counter()
+                aggregator.update(batch)
+                stats.transform_seconds += time.perf_counter() - start
+                stats.batches += 1
+                stats.rows += batch.num_rows
+        stats.read_seconds = reader.read_seconds
+        stats.reader_stall_seconds = reader.stall_seconds
+    stats.wall_seconds = time.perf_counter() - wall_start
+
+    return aggregator.result(), stats
+
+
+def aggregate_table(
+    table: pa.Table,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    aggregator: Optional[BatchAggregator] = None,
+) -> pa.Table:
+    """Run the pipeline's transform stage over an in-memory table (no reader)."""
+    aggregator = aggregator or _GroupByAggregator()
+    for batch in table.select(list(aggregator.columns)).to_batches(batch_rows):
+        aggregator.update(batch)
+    return aggregator.result()
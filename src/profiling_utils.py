@@ -6,6 +6,9 @@ from typing import Any, Callable, Tuple
 
 from rich.console import Console
 
+CPU_CACHE_DIR = Path("/sys/devices/system/cpu/cpu0/cache")
+DEFAULT_CACHE_SIZES = {"L1": 32 * 1024, "L2": 1024 * 1024, "L3": 32 * 1024 * 1024}
+
 console = Console()
 
 
@@ -43,4 +46,56 @@ def run_with_cprofile(func: Callable, output_path: Path, *args, **kwargs) -> Any
     result = profiler.runcall(func, *args, **kwargs)
     profiler.dump_stats(output_path)
     console.print(f"[bold blue]cProfile[/bold blue] stats written to {output_path}")
-    return result
\ No newline at end of file
+    return result
+
+
+def cache_sizes() -> dict[str, int]:
+    """
+    Per-level data cache sizes in bytes for CPU 0, read from sysfs on Linux.
+    Falls back to typical server values when sysfs is unavailable.
+    """
+    sizes: dict[str, int] = {}
+    for index in sorted(CPU_CACHE_DIR.glob("index*")):
+        try:
+            if (index / "type").read_text().strip() == "Instruction":
+                continue
+            level = f"L{(index / 'level').read_text().strip()}"
+            raw = (index / "size").read_text().strip().upper()
+        except OSError:
+            continue
+        multiplier = {"K": 1024, "M": 1024 * 1024}.get(raw[-1], 1)
+        sizes[level] = int(raw.rstrip("KM")) * multiplier
+    return sizes or dict(DEFAULT_CACHE_SIZES)
+
+
+def fits_in_cache(n_bytes: int, sizes: dict[str, int]) -> str:
+    """Smallest cache level that holds `n_bytes`, or "RAM"."""
+    for level in sorted(sizes):
+        if n_bytes <= sizes[level]:
+            return level
+    return "RAM"
+
+
+def process_memory_kb() -> dict[str, int]:
+    """
+    Current RSS, peak RSS (VmHWM) and PSS of this process in KB (Linux /proc).
+
+    PSS splits shared pages between the processes mapping them, so summing it
+    across workers shows whether they share one copy of a dataset or each hold
+    their own. Missing fields are reported as 0.
+    """
+    memory = {"rss": 0, "peak_rss": 0, "pss": 0}
+    sources = (
+        ("/proc/self/status", {"VmRSS:": "rss", "VmHWM:": "peak_rss"}),
+        ("/proc/self/smaps_rollup", {"Pss:": "pss"}),
+    )
+    for path, fields in sources:
+        try:
+            with open(path, encoding="ascii") as f:
+                for line in f:
+                    key = line.split(maxsplit=1)[0] if line.strip() else ""
+                    if key in fields:
+                        memory[fields[key]] = int(line.split()[1])
+        except OSError:
+            continue
+    return memory
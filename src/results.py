@@ -0,0 +1,77 @@
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+# Every variant handler, transform and join returns one of these, built by
+# `result_table`: columns (<key>: uint64, count: int64, sum: float64,
+# mean: float64) sorted by key. Python objects are only built at the display
+# edge via `to_rows`.
+ResultTable = Union[pa.Table, pa.RecordBatch]
+
+
+def _as_arrow(values, type: pa.DataType):
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        return values.cast(type)
+    return pa.array(values, type=type)
+
+
+def result_table(keys, counts, sums, key_name: str = "event_type") -> pa.Table:
+    """
+    Build a result table from per-group key/count/sum arrays (NumPy or Arrow,
+    wrapped without copying where the types already match); mean is computed in Arrow.
+    """
+    keys = _as_arrow(keys, pa.uint64())
+    counts = _as_arrow(counts, pa.int64())
+    sums = _as_arrow(sums, pa.float64())
+    return pa.table(
+        {
+            key_name: keys,
+            "count": counts,
+            "sum": sums,
+            "mean": pc.divide(sums, pc.cast(counts, pa.float64())),
+        }
+    )
+
+
+def normalize_result(result: ResultTable, key_name: str = "event_type") -> pa.Table:
+    """
+    Cast a library-produced (Polars, DuckDB, pandas) result with key/count/sum
+    columns to the standard schema; Polars counts come back as uint32 and keys
+    keep whatever width the input column had.
+    """
+    return result_table(result[key_name], result["count"], result["sum"], key_name=key_name)
+
+
+def table_from_totals(
+    totals: dict[int, dict[str, float]], key_name: str = "event_type"
+) -> pa.Table:
+    """Result table from the row-wise variants' `{key: {"count", "sum"}}` dicts."""
+    keys = sorted(totals)
+    return result_table(
+        pa.array(keys, type=pa.uint64()),
+        np.fromiter((totals[k]["count"] for k in keys), dtype=np.int64, count=len(keys)),
+        np.fromiter((totals[k]["sum"] for k in keys), dtype=np.float64, count=len(keys)),
+        key_name=key_name,
+    )
+
+
+def write_result_csv(result: ResultTable, output_path: Path) -> None:
+    """Write a result as CSV with a plain (unquoted) header, as the old DictWriter output."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("wb") as f:
+        f.write((",".join(result.schema.names) + "\n").encode("utf-8"))
+        pa_csv.write_csv(result, f, pa_csv.WriteOptions(include_header=False))
+
+
+def to_rows(result: Union[ResultTable, list[dict]]) -> list[dict]:
+    """
+    Convert a result to Python dicts for display. Plugin variants written
+    against the old `list[dict]` contract pass through unchanged.
+    """
+    if isinstance(result, list):
+        return result
+    return result.to_pylist()
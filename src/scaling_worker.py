@@ -0,0 +1,97 @@
+"""
+Child process for the out-of-core scaling benchmark.
+
+Usage: python -m src.scaling_worker <variant> <input_path>
+
+Runs the variant's untimed "prepare" step (if any), then its handler, and
+prints a final JSON line with wall seconds, prepare seconds, peak RSS and the
+peak size of the spill directory (SCALING_SPILL_DIR), which DuckDB and Polars
+are pointed at by the parent process.
+"""
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+SPILL_POLL_SECONDS = 0.05
+
+
+def _dir_bytes(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue  # spill file removed while walking
+    return total
+
+
+class _SpillMonitor(threading.Thread):
+    """Polls the spill directory and keeps the largest size seen."""
+
+    def __init__(self, path: Path | None):
+        super().__init__(daemon=True)
+        self.path = path
+        self.peak_bytes = 0
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while self.path and not self._done.wait(SPILL_POLL_SECONDS):
+            self.peak_bytes = max(self.peak_bytes, _dir_bytes(self.path))
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+        if self.path:
+            self.peak_bytes = max(self.peak_bytes, _dir_bytes(self.path))
+
+
+def _peak_rss_kb() -> int:
+    """
+    Peak RSS of this process. Prefers /proc VmHWM because ru_maxrss survives
+    the fork+exec from the (possibly much larger) parent benchmark process.
+    """
+    from src.profiling_utils import process_memory_kb
+
+    return process_memory_kb()["peak_rss"] or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def main(argv: list[str]) -> int:
+    variant_key, input_path = argv[0], Path(argv[1])
+    from src.variants_registry import get_handler, get_prepare
+
+    handler = get_handler(variant_key)
+    prepare = get_prepare(variant_key)
+    prepare_seconds = 0.0
+    if prepare is not None:
+        start = time.perf_counter()
+        prepare(input_path)
+        prepare_seconds = time.perf_counter() - start
+    spill_dir = os.environ.get("SCALING_SPILL_DIR")
+    monitor = _SpillMonitor(Path(spill_dir) if spill_dir else None)
+    monitor.start()
+    start = time.perf_counter()
+    handler(input_path, None)
+    seconds = time.perf_counter() - start
+    monitor.stop()
+    if "src.variant_e" in sys.modules:  # DuckDB-backed variants; don't import it otherwise
+        sys.modules["src.variant_e"].close_connections()
+    print(
+        json.dumps(
+            {
+                "seconds": seconds,
+                "prepare_seconds": prepare_seconds,
+                "peak_rss_kb": _peak_rss_kb(),
+                "spill_bytes": monitor.peak_bytes,
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,188 @@
+import sys
+import threading
+import uuid
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+SEGMENT_PREFIX = "micro_etl_"
+
+
+@dataclass(frozen=True)
+class BufferRef:
+    """One Arrow buffer copied into a named shared-memory segment."""
+
+    segment: str
+    size: int
+
+
+@dataclass(frozen=True)
+class ColumnRef:
+    """Enough to rebuild one column with `pa.Array.from_buffers`, zero-copy."""
+
+    name: str
+    length: int
+    null_count: int
+    offset: int
+    buffers: tuple[Optional[BufferRef], ...]
+
+
+@dataclass(frozen=True)
+class DatasetHandle:
+    """Picklable description of a shared dataset; pass it to worker processes."""
+
+    schema: bytes
+    num_rows: int
+    columns: tuple[ColumnRef, ...]
+
+    def segment_names(self) -> list[str]:
+        return [b.segment for c in self.columns for b in c.buffers if b is not None]
+
+
+def read_table(path: Path, columns: Optional[Sequence[str]] = None) -> pa.Table:
+    """Decode a Parquet, Arrow IPC, CSV or JSONL dataset into an Arrow table."""
+    fmt = path.suffix.lower().lstrip(".")
+    if fmt == "parquet":
+        table = pq.read_table(path, columns=list(columns) if columns else None)
+    elif fmt == "arrow":
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    elif fmt == "csv":
+        table = pa_csv.read_csv(path)
+    elif fmt == "jsonl":
+        table = pa_json.read_json(path)
+    else:
+        raise ValueError(f"Unsupported format for shared datasets: {path.suffix}")
+    return table.select(list(columns)) if columns and fmt != "parquet" else table
+
+
+_attach_lock = threading.Lock()
+
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing segment without registering it with the resource
+    tracker. A spawned worker's tracker would otherwise unlink the segment
+    when the worker exits, and unregistering afterwards breaks forked workers,
+    which share the owner's tracker.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedDataset:
+    """
+    Owner of a dataset decoded once into shared-memory column buffers.
+
+    Each Arrow buffer (validity, offsets, data) of each column is copied into
+    its own segment, so attached tables are ordinary Arrow arrays that point
+    straight at shared pages. Use as a context manager; segments are unlinked
+    on close.
+    """
+
+    def __init__(self, table: pa.Table):
+        self._segments: list[shared_memory.SharedMemory] = []
+        self.nbytes = 0
+        columns = []
+        try:
+            for name in table.column_names:
+                array = table[name].combine_chunks()
+                refs = tuple(self._share(buf) for buf in array.buffers())
+                columns.append(
+                    ColumnRef(name, len(array), array.null_count, array.offset, refs)
+                )
+        except BaseException:
+            self.close()
+            raise
+        self.handle = DatasetHandle(
+            schema=table.schema.serialize().to_pybytes(),
+            num_rows=table.num_rows,
+            columns=tuple(columns),
+        )
+
+    @classmethod
+    def from_path(cls, path: Path, columns: Optional[Sequence[str]] = None) -> "SharedDataset":
+        return cls(read_table(path, columns))
+
+    def _share(self, buf: Optional[pa.Buffer]) -> Optional[BufferRef]:
+        if buf is None:
+            return None
+        segment = shared_memory.SharedMemory(
+            name=f"{SEGMENT_PREFIX}{uuid.uuid4().hex[:16]}",
+            create=True,
+            size=max(1, buf.size),
+        )
+        self._segments.append(segment)
+        segment.buf[: buf.size] = memoryview(buf).cast("B")
+        self.nbytes += buf.size
+        return BufferRef(segment.name, buf.size)
+
+    def close(self) -> None:
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments.clear()
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AttachedDataset:
+    """
+    Zero-copy view of a `SharedDataset` from any process.
+
+    `table` references the shared pages directly; drop every reference to it
+    (and anything sliced from it) before `close()`.
+    """
+
+    def __init__(self, handle: DatasetHandle):
+        self._segments: dict[str, shared_memory.SharedMemory] = {}
+        schema = pa.ipc.read_schema(pa.py_buffer(handle.schema))
+        arrays = []
+        for col, schema_field in zip(handle.columns, schema):
+            buffers = [self._buffer(ref) for ref in col.buffers]
+            arrays.append(
+                pa.Array.from_buffers(
+                    schema_field.type, col.length, buffers, col.null_count, col.offset
+                )
+            )
+        self.table: Optional[pa.Table] = pa.Table.from_arrays(arrays, schema=schema)
+
+    def _buffer(self, ref: Optional[BufferRef]) -> Optional[pa.Buffer]:
+        if ref is None:
+            return None
+        segment = _attach_segment(ref.segment)
+        self._segments[ref.segment] = segment
+        return pa.py_buffer(segment.buf[: ref.size])
+
+    def close(self) -> None:
+        self.table = None
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+
+    def __enter__(self) -> "AttachedDataset":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def attach(handle: DatasetHandle) -> AttachedDataset:
+    return AttachedDataset(handle)
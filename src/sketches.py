@@ -0,0 +1,236 @@
+import math
+from typing import Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+
+from src.config import settings
+
+DEFAULT_HLL_PRECISION = 12
+DEFAULT_KLL_K = 200
+DEFAULT_QUANTILES = (0.5, 0.99)
+SKETCH_COLUMNS = ["event_types", "user_ids", "values"]
+
+_BIT_LENGTH_SHIFTS = (32, 16, 8, 4, 2, 1)
+# HyperLogLog bias constants for small register counts; 0.7213/(1+1.079/m) from m=128 up.
+_HLL_SMALL_ALPHA = {16: 0.673, 32: 0.697, 64: 0.709}
+
+
+def hash64(keys: np.ndarray) -> np.ndarray:
+    """Vectorized splitmix64 finalizer; spreads integer keys over all 64 bits."""
+    x = np.asarray(keys).astype(np.uint64, copy=True)
+    with np.errstate(over="ignore"):
+        x += np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """Exact per-element bit length of a uint64 array (0 for 0)."""
+    x = x.copy()
+    n = np.zeros(x.shape, dtype=np.int64)
+    for shift in _BIT_LENGTH_SHIFTS:
+        mask = x >= np.uint64(1 << shift)
+        n[mask] += shift
+        x[mask] >>= np.uint64(shift)
+    return n + (x > 0)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch with 2**precision one-byte registers.
+
+    Standard error is about 1.04 / sqrt(2**precision); sketches with the same
+    precision merge by taking the register-wise maximum.
+    """
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, keys: np.ndarray) -> None:
+        if len(keys) == 0:
+            return
+        hashed = hash64(keys)
+        tail_bits = 64 - self.precision
+        index = (hashed >> np.uint64(tail_bits)).astype(np.intp)
+        tail = hashed & np.uint64((1 << tail_bits) - 1)
+        rank = (tail_bits - _bit_length(tail) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        alpha = _HLL_SMALL_ALPHA.get(self.m, 0.7213 / (1 + 1.079 / self.m))
+        raw = alpha * self.m * self.m / float(np.sum(np.exp2(-self.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * self.m and zeros:
+            return self.m * math.log(self.m / zeros)  # linear counting for small sets
+        return raw
+
+    @property
+    def nbytes(self) -> int:
+        return self.registers.nbytes
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch over float64 values.
+
+    Level `h` holds items of weight 2**h; an over-full level is sorted and every
+    other item (random offset) is promoted. Memory is O(k log(n/k)) and sketches
+    merge by concatenating levels and re-compacting.
+    """
+
+    def __init__(self, k: int = DEFAULT_KLL_K, seed: Optional[int] = settings.SEED):
+        if k < 8:
+            raise ValueError("KLL k must be >= 8")
+        self.k = k
+        self.n = 0
+        self.levels: list[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compact(self, level: int) -> None:
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        items = np.sort(self.levels[level])
+        keep = items[-1:] if len(items) % 2 else items[:0]
+        items = items[: len(items) - len(keep)]
+        offset = int(self._rng.integers(2))
+        self.levels[level] = keep.copy()
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset::2]])
+
+    def _compress(self) -> None:
+        while True:
+            for level, items in enumerate(self.levels):
+                if len(items) > self._capacity(level):
+                    self._compact(level)
+                    break
+            else:
+                return
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+
+    def quantiles(self, qs: Sequence[float]) -> list[float]:
+        items = np.concatenate(self.levels)
+        if len(items) == 0:
+            return [float("nan")] * len(qs)
+        weights = np.concatenate(
+            [np.full(len(level), 1 << h, dtype=np.int64) for h, level in enumerate(self.levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        idx = np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(items) - 1)
+        return [float(v) for v in items[idx]]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(level.nbytes for level in self.levels)
+
+
+class SketchAggregator:
+    """
+    Per-`event_types` HyperLogLog of `user_ids` plus KLL of `values`.
+
+    Plugs into `pipeline.run_pipelined` as its transform; independent
+    aggregators (per chunk or per worker) combine with `merge`, as the
+    per-partition sketches of `bench.parallel_transform --sketch` do.
+    """
+
+    columns = SKETCH_COLUMNS
+
+    def __init__(
+        self,
+        hll_precision: int = DEFAULT_HLL_PRECISION,
+        kll_k: int = DEFAULT_KLL_K,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        seed: Optional[int] = settings.SEED,
+    ):
+        self.hll_precision = hll_precision
+        self.kll_k = kll_k
+        self.quantiles = tuple(quantiles)
+        self._rng = np.random.default_rng(seed)
+        self.groups: dict[int, tuple[HyperLogLog, KLLSketch]] = {}
+
+    def _group(self, event_type: int) -> tuple[HyperLogLog, KLLSketch]:
+        if event_type not in self.groups:
+            self.groups[event_type] = (
+                HyperLogLog(self.hll_precision),
+                KLLSketch(self.kll_k, seed=int(self._rng.integers(2**32))),
+            )
+        return self.groups[event_type]
+
+    def update_arrays(
+        self, event_types: np.ndarray, user_ids: np.ndarray, values: np.ndarray
+    ) -> None:
+        order = np.argsort(event_types, kind="stable")
+        sorted_types = event_types[order]
+        uniques, starts = np.unique(sorted_types, return_index=True)
+        bounds = np.append(starts, len(sorted_types))
+        for i, et in enumerate(uniques):
+            rows = order[bounds[i] : bounds[i + 1]]
+            hll, kll = self._group(int(et))
+            hll.update(user_ids[rows])
+            kll.update(values[rows])
+
+    def update(self, batch: pa.RecordBatch) -> None:
+        self.update_arrays(
+            batch.column("event_types").to_numpy(zero_copy_only=False),
+            batch.column("user_ids").to_numpy(zero_copy_only=False),
+            batch.column("values").to_numpy(zero_copy_only=False),
+        )
+
+    def merge(self, other: "SketchAggregator") -> None:
+        for et, (hll, kll) in other.groups.items():
+            mine_hll, mine_kll = self._group(et)
+            mine_hll.merge(hll)
+            mine_kll.merge(kll)
+
+    def rows(self) -> list[dict]:
+        rows = []
+        for et in sorted(self.groups):
+            hll, kll = self.groups[et]
+            row = {"event_type": et, "count": kll.n, "distinct_users": hll.estimate()}
+            for q, value in zip(self.quantiles, kll.quantiles(self.quantiles)):
+                row[quantile_label(q)] = value
+            rows.append(row)
+        return rows
+
+    def result(self) -> pa.Table:
+        """`rows()` as an Arrow table, the `pipeline.BatchAggregator` result."""
+        return pa.Table.from_pylist(self.rows())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(hll.nbytes + kll.nbytes for hll, kll in self.groups.values())
+
+
+def quantile_label(q: float) -> str:
+    """Column name for a quantile, e.g. 0.5 -> "p50", 0.999 -> "p99.9"."""
+    return f"p{q * 100:g}"
@@ -1,20 +1,14 @@
 import csv
 from pathlib import Path
-from typing import Iterable
-
-from src.profiling_utils import timer
 
+import pyarrow as pa
 
-def _write_output(rows: Iterable[dict], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["event_type", "count", "sum", "mean"])
-        writer.writeheader()
-        writer.writerows(rows)
+from src.profiling_utils import timer
+from src.results import table_from_totals, write_result_csv
 
 
 @timer
-def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
+def run(input_path: Path, output_path: Path | None = None) -> pa.Table:
     """
     Variant A: pure Python row-based processing using CSV input.
     Aggregates count/sum/mean of `values` grouped by `event_types`.
@@ -30,18 +24,40 @@ def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
             group["count"] += 1
             group["sum"] += val
 
-    results = [
-        {
-            "event_type": et,
-            "count": stats["count"],
-            "sum": stats["sum"],
-            "mean": stats["sum"] / stats["count"] if stats["count"] else 0.0,
-        }
-        for et, stats in sorted(totals.items())
-    ]
+    results = table_from_totals(totals)
 
     if output_path:
-        _write_output(results, output_path)
+        write_result_csv(results, output_path)
 
     return results
 
+
+def transform(table: pa.Table) -> pa.Table:
+    """
+    Variant A transform on an in-memory table: the same per-row dict
+    aggregation, fed from Python values instead of CSV rows.
+    """
+    totals: dict[int, dict[str, float]] = {}
+    for event_type, val in zip(table["event_types"].to_pylist(), table["values"].to_pylist()):
+        group = totals.setdefault(event_type, {"count": 0, "sum": 0.0})
+        group["count"] += 1
+        group["sum"] += val
+    return table_from_totals(totals)
+
+
+def join_aggregate(facts: pa.Table, users: pa.Table) -> pa.Table:
+    """
+    Variant A join: build a Python dict from `user_ids` to `segment`, then
+    probe it row by row and aggregate count/sum/mean of `values` per segment.
+    """
+    segment_by_user = dict(zip(users["user_ids"].to_pylist(), users["segment"].to_pylist()))
+    totals: dict[int, dict[str, float]] = {}
+    for user_id, val in zip(facts["user_ids"].to_pylist(), facts["values"].to_pylist()):
+        segment = segment_by_user.get(user_id)
+        if segment is None:
+            continue
+        group = totals.setdefault(segment, {"count": 0, "sum": 0.0})
+        group["count"] += 1
+        group["sum"] += val
+
+    return table_from_totals(totals, key_name="segment")
@@ -1,50 +1,105 @@
-import csv
 from pathlib import Path
 
 import numpy as np
+import pyarrow as pa
 import pyarrow.parquet as pq
 
 from src.profiling_utils import timer
-
-
-def _write_output(rows: list[dict], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["event_type", "count", "sum", "mean"])
-        writer.writeheader()
-        writer.writerows(rows)
+from src.results import result_table, write_result_csv
 
 
 @timer
-def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
+def run(input_path: Path, output_path: Path | None = None) -> pa.Table:
     """
     Variant B: NumPy batched aggregation from Parquet input.
     """
-    table = pq.read_table(input_path)
+    results = transform(pq.read_table(input_path))
+
+    if output_path:
+        write_result_csv(results, output_path)
+
+    return results
+
+
+def transform(table: pa.Table) -> pa.Table:
+    """
+    Variant B transform: sort-based NumPy group-by over an Arrow table.
+    `np.unique` maps each event type to a dense group index, then `bincount`
+    sums per group, so cost grows with n log n rather than rows x groups.
+    """
     event_types = table["event_types"].to_numpy()
     values = table["values"].to_numpy()
 
-    unique_types = np.unique(event_types)
-    results: list[dict] = []
-    for et in unique_types:
-        mask = event_types == et
-        count = int(mask.sum())
-        if count == 0:
-            continue
-        sum_val = float(values[mask].sum())
-        results.append(
-            {
-                "event_type": int(et),
-                "count": count,
-                "sum": sum_val,
-                "mean": sum_val / count,
-            }
-        )
-
-    results.sort(key=lambda r: r["event_type"])
+    unique_types, inverse = np.unique(event_types, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(unique_types))
+    sums = np.bincount(inverse, weights=values, minlength=len(unique_types))
+    return result_table(unique_types, counts, sums)
 
-    if output_path:
-        _write_output(results, output_path)
 
-    return results
+def _aggregate_by_segment(segments: np.ndarray, values: np.ndarray) -> pa.Table:
+    counts = np.bincount(segments)
+    sums = np.bincount(segments, weights=values)
+    present = np.flatnonzero(counts)
+    return result_table(present, counts[present], sums[present], key_name="segment")
+
 
+def _probe_sorted(
+    sorted_keys: np.ndarray, sorted_segments: np.ndarray, fact_keys: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Binary-search `fact_keys` in `sorted_keys`; return (matched mask, segments)."""
+    pos = np.searchsorted(sorted_keys, fact_keys)
+    pos[pos == len(sorted_keys)] = 0
+    matched = sorted_keys[pos] == fact_keys
+    return matched, sorted_segments[pos[matched]]
+
+
+def join_searchsorted(facts: pa.Table, users: pa.Table) -> pa.Table:
+    """
+    Variant B join: sort the dimension once, then binary-search every fact key.
+    Probes arrive in random order, so each lookup walks a cold path through
+    the sorted key array once it outgrows cache.
+    """
+    dim_keys = users["user_ids"].to_numpy()
+    order = np.argsort(dim_keys, kind="stable")
+    fact_keys = facts["user_ids"].to_numpy()
+    values = facts["values"].to_numpy()
+    matched, segments = _probe_sorted(
+        dim_keys[order], users["segment"].to_numpy()[order], fact_keys
+    )
+    return _aggregate_by_segment(segments, values[matched])
+
+
+def join_sorted_probe(facts: pa.Table, users: pa.Table) -> pa.Table:
+    """
+    Variant B join: sort both sides by key, then binary-search the sorted fact
+    keys in the sorted dimension. Still one searchsorted probe per fact (not a
+    merge), but sorting the facts costs O(n log n) up front and makes probes
+    monotone, so the dimension is walked through cache in order instead of
+    accessed randomly.
+    """
+    dim_keys = users["user_ids"].to_numpy()
+    dim_order = np.argsort(dim_keys, kind="stable")
+    fact_keys = facts["user_ids"].to_numpy()
+    fact_order = np.argsort(fact_keys, kind="stable")
+    values = facts["values"].to_numpy()[fact_order]
+    matched, segments = _probe_sorted(
+        dim_keys[dim_order], users["segment"].to_numpy()[dim_order], fact_keys[fact_order]
+    )
+    return _aggregate_by_segment(segments, values[matched])
+
+
+def join_direct(facts: pa.Table, users: pa.Table) -> pa.Table:
+    """
+    Variant B join: direct-addressed lookup table indexed by key, the NumPy
+    analogue of a perfect hash table. One random gather per fact row; the
+    table is `max(user_ids) + 1` entries, so keys must be dense.
+    """
+    dim_keys = users["user_ids"].to_numpy()
+    lookup = np.full(int(dim_keys.max()) + 1, -1, dtype=np.int16)
+    lookup[dim_keys] = users["segment"].to_numpy()
+    fact_keys = facts["user_ids"].to_numpy()
+    in_range = fact_keys < len(lookup)
+    segments = np.full(len(fact_keys), -1, dtype=np.int16)
+    segments[in_range] = lookup[fact_keys[in_range]]
+    matched = segments >= 0
+    return _aggregate_by_segment(segments[matched], facts["values"].to_numpy()[matched])
@@ -1,25 +1,20 @@
-import csv
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
 
 from src.profiling_utils import timer
+from src.results import result_table, write_result_csv
 
 
-def _write_output(rows: list[dict], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["event_type", "count", "sum", "mean"])
-        writer.writeheader()
-        writer.writerows(rows)
+def _to_arrow(agg: pd.DataFrame, key_name: str) -> pa.Table:
+    # Numeric, null-free columns: Arrow wraps the NumPy buffers without per-row objects.
+    return result_table(
+        agg[key_name].to_numpy(), agg["count"].to_numpy(), agg["sum"].to_numpy(), key_name
+    )
 
 
-@timer
-def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
-    """
-    Variant C: Pandas batched DataFrame operations from Parquet input.
-    """
-    df = pd.read_parquet(input_path)
+def _aggregate(df: pd.DataFrame) -> pa.Table:
     agg = (
         df.groupby("event_types")["values"]
         .agg(["count", "sum", "mean"])
@@ -27,10 +22,38 @@ def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
         .rename(columns={"event_types": "event_type"})
         .sort_values("event_type")
     )
-    rows = agg.to_dict(orient="records")
+    return _to_arrow(agg, "event_type")
+
+
+@timer
+def run(input_path: Path, output_path: Path | None = None) -> pa.Table:
+    """
+    Variant C: Pandas batched DataFrame operations from Parquet input.
+    """
+    rows = _aggregate(pd.read_parquet(input_path))
 
     if output_path:
-        _write_output(rows, output_path)
+        write_result_csv(rows, output_path)
 
     return rows
 
+
+def transform(table: pa.Table) -> pa.Table:
+    """Variant C transform: pandas groupby over an in-memory Arrow table."""
+    return _aggregate(table.select(["event_types", "values"]).to_pandas())
+
+
+def join_aggregate(facts: pa.Table, users: pa.Table) -> pa.Table:
+    """
+    Variant C join: pandas hash join (`merge`) on `user_ids`, then group by segment.
+    """
+    fact_df = facts.select(["user_ids", "values"]).to_pandas()
+    user_df = users.select(["user_ids", "segment"]).to_pandas()
+    agg = (
+        fact_df.merge(user_df, on="user_ids", how="inner")
+        .groupby("segment")["values"]
+        .agg(["count", "sum", "mean"])
+        .reset_index()
+        .sort_values("segment")
+    )
+    return _to_arrow(agg, "segment")
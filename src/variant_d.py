@@ -1,27 +1,84 @@
 from pathlib import Path
-import csv
 
 import polars as pl
+import pyarrow as pa
 
 from src.profiling_utils import timer
+from src.results import normalize_result, write_result_csv
 
 
-def _write_output(rows: list[dict], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["event_type", "count", "sum", "mean"])
-        writer.writeheader()
-        writer.writerows(rows)
+def _aggregate(lazy: pl.LazyFrame) -> pl.LazyFrame:
+    return (
+        lazy.group_by("event_types")
+        .agg(
+            [
+                pl.len().alias("count"),
+                pl.col("values").sum().alias("sum"),
+                pl.col("values").mean().alias("mean"),
+            ]
+        )
+        .rename({"event_types": "event_type"})
+        .sort("event_type")
+    )
+
+
+def _collect_streaming(lazy: pl.LazyFrame) -> pl.DataFrame:
+    try:
+        return lazy.collect(engine="streaming")
+    except TypeError:  # polars < 1.0 only has the boolean flag
+        return lazy.collect(streaming=True)
 
 
 @timer
-def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
+def run(input_path: Path, output_path: Path | None = None) -> pa.Table:
     """
     Variant D: Polars columnar, multi-threaded aggregation on Parquet input.
     """
+    df = _aggregate(pl.scan_parquet(input_path)).collect()
+    rows = normalize_result(df.to_arrow())
+
+    if output_path:
+        write_result_csv(rows, output_path)
+
+    return rows
+
+
+@timer
+def run_streaming(input_path: Path, output_path: Path | None = None) -> pa.Table:
+    """
+    Variant D (streaming): same query on the Polars streaming engine, which
+    processes the Parquet scan in morsels instead of materializing it.
+    """
+    df = _collect_streaming(_aggregate(pl.scan_parquet(input_path)))
+    rows = normalize_result(df.to_arrow())
+
+    if output_path:
+        write_result_csv(rows, output_path)
+
+    return rows
+
+
+def transform(table: pa.Table) -> pa.Table:
+    """Variant D transform: Polars aggregation over a zero-copy Arrow table."""
+    df = _aggregate(pl.from_arrow(table).lazy()).collect()
+    return normalize_result(df.to_arrow())
+
+
+def transform_streaming(table: pa.Table) -> pa.Table:
+    """Variant D (streaming) transform on an in-memory Arrow table."""
+    df = _collect_streaming(_aggregate(pl.from_arrow(table).lazy()))
+    return normalize_result(df.to_arrow())
+
+
+def join_aggregate(facts: pa.Table, users: pa.Table) -> pa.Table:
+    """
+    Variant D join: Polars hash join on `user_ids` over zero-copy Arrow inputs.
+    """
     df = (
-        pl.scan_parquet(input_path)
-        .group_by("event_types")
+        pl.from_arrow(facts.select(["user_ids", "values"]))
+        .lazy()
+        .join(pl.from_arrow(users.select(["user_ids", "segment"])).lazy(), on="user_ids")
+        .group_by("segment")
         .agg(
             [
                 pl.len().alias("count"),
@@ -29,14 +86,7 @@ def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
                 pl.col("values").mean().alias("mean"),
             ]
         )
-        .rename({"event_types": "event_type"})
-        .sort("event_type")
+        .sort("segment")
         .collect()
     )
-    rows = df.to_dicts()
-
-    if output_path:
-        _write_output(rows, output_path)
-
-    return rows
-
+    return normalize_result(df.to_arrow(), key_name="segment")
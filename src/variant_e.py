@@ -1,38 +1,181 @@
-import csv
+import re
+import threading
 from pathlib import Path
 
 import duckdb
+import pyarrow as pa
 
+from src.config import settings
 from src.profiling_utils import timer
+from src.results import normalize_result, write_result_csv
 
+AGG_SELECT = """
+    SELECT
+        event_types AS event_type,
+        COUNT(*)   AS count,
+        SUM(values) AS sum,
+        AVG(values) AS mean
+    FROM {source}
+    GROUP BY 1
+    ORDER BY 1
+"""
 
-def _write_output(rows: list[dict], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["event_type", "count", "sum", "mean"])
-        writer.writeheader()
-        writer.writerows(rows)
+JOIN_SELECT = """
+    SELECT
+        u.segment     AS segment,
+        COUNT(*)      AS count,
+        SUM(f.values) AS sum,
+        AVG(f.values) AS mean
+    FROM join_facts f
+    JOIN join_users u USING (user_ids)
+    GROUP BY 1
+    ORDER BY 1
+"""
+
+_connections: dict[str, duckdb.DuckDBPyConnection] = {}
+_connections_lock = threading.Lock()
+
+
+def connection_config() -> dict:
+    """DuckDB settings applied to every connection this module opens."""
+    config: dict = {}
+    if settings.DUCKDB_THREADS:
+        config["threads"] = settings.DUCKDB_THREADS
+    if settings.DUCKDB_MEMORY_LIMIT:
+        config["memory_limit"] = settings.DUCKDB_MEMORY_LIMIT
+    if settings.DUCKDB_TEMP_DIR:
+        config["temp_directory"] = str(settings.DUCKDB_TEMP_DIR)
+    return config
+
+
+def get_connection(database: Path | str = ":memory:") -> duckdb.DuckDBPyConnection:
+    """Return the process-wide connection for `database`, opening it on first use."""
+    key = str(database)
+    with _connections_lock:
+        if key not in _connections:
+            if isinstance(database, Path):
+                database.parent.mkdir(parents=True, exist_ok=True)
+            _connections[key] = duckdb.connect(key, config=connection_config())
+        return _connections[key]
+
+
+def close_connections() -> None:
+    """Close every cached connection, releasing the persistent database file lock."""
+    with _connections_lock:
+        for con in _connections.values():
+            con.close()
+        _connections.clear()
+
+
+def table_name_for(input_path: Path) -> str:
+    """Native table name for a source Parquet file, e.g. sweep_e_16kb.parquet -> t_sweep_e_16kb."""
+    return "t_" + re.sub(r"\W", "_", input_path.stem)
+
+
+def ingest(
+    input_path: Path,
+    database: Path | None = None,
+    force: bool = False,
+) -> str:
+    """
+    Load a Parquet file into a native table in the persistent DuckDB database.
+
+    The source path, size and mtime are recorded in `_ingest_log`; the table is
+    only rebuilt when the source changes (or `force` is set). Returns the table name.
+    """
+    con = get_connection(database or settings.DUCKDB_PATH)
+    table = table_name_for(input_path)
+    stat = input_path.stat()
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS _ingest_log "
+        "(table_name VARCHAR PRIMARY KEY, source VARCHAR, size BIGINT, mtime_ns BIGINT)"
+    )
+    current = con.execute(
+        "SELECT source, size, mtime_ns FROM _ingest_log WHERE table_name = ?", [table]
+    ).fetchone()
+    if not force and current == (str(input_path.resolve()), stat.st_size, stat.st_mtime_ns):
+        return table
+
+    # One transaction, so an interrupted ingest never leaves a stale log entry.
+    con.execute("BEGIN TRANSACTION")
+    try:
+        con.execute(
+            f"CREATE OR REPLACE TABLE {table} AS "
+            f"SELECT * FROM read_parquet('{input_path.as_posix()}')"
+        )
+        con.execute(
+            "INSERT OR REPLACE INTO _ingest_log VALUES (?, ?, ?, ?)",
+            [table, str(input_path.resolve()), stat.st_size, stat.st_mtime_ns],
+        )
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    con.execute("COMMIT")
+    return table
+
+
+def query_parquet(con: duckdb.DuckDBPyConnection, input_path: Path) -> pa.Table:
+    source = f"parquet_scan('{input_path.as_posix()}')"
+    return normalize_result(con.execute(AGG_SELECT.format(source=source)).fetch_arrow_table())
+
+
+def query_native(con: duckdb.DuckDBPyConnection, table: str) -> pa.Table:
+    return normalize_result(con.execute(AGG_SELECT.format(source=table)).fetch_arrow_table())
 
 
 @timer
-def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
+def run(input_path: Path, output_path: Path | None = None) -> pa.Table:
     """
     Variant E: DuckDB SQL aggregation on Parquet input.
     """
-    query = f"""
-        SELECT
-            event_types AS event_type,
-            COUNT(*)   AS count,
-            SUM(values) AS sum,
-            AVG(values) AS mean
-        FROM parquet_scan('{input_path.as_posix()}')
-        GROUP BY 1
-        ORDER BY 1
+    rows = query_parquet(get_connection(), input_path)
+
+    if output_path:
+        write_result_csv(rows, output_path)
+
+    return rows
+
+
+@timer
+def run_native(input_path: Path, output_path: Path | None = None) -> pa.Table:
     """
-    rows = duckdb.query(query).to_df().to_dict(orient="records")
+    Variant E (native): ingest the Parquet input once into the persistent
+    DuckDB database, then aggregate the native table over a reused connection.
+    """
+    table = ingest(input_path)
+    rows = query_native(get_connection(settings.DUCKDB_PATH), table)
 
     if output_path:
-        _write_output(rows, output_path)
+        write_result_csv(rows, output_path)
 
     return rows
 
+
+def transform(table: pa.Table) -> pa.Table:
+    """
+    Variant E transform: DuckDB aggregation over an Arrow table registered
+    on the reused in-memory connection (no Parquet scan or ingest).
+    """
+    con = get_connection()
+    con.register("input_table", table)
+    try:
+        return normalize_result(
+            con.execute(AGG_SELECT.format(source="input_table")).fetch_arrow_table()
+        )
+    finally:
+        con.unregister("input_table")
+
+
+def join_aggregate(facts: pa.Table, users: pa.Table) -> pa.Table:
+    """
+    Variant E join: DuckDB hash join over Arrow tables registered on the
+    reused in-memory connection.
+    """
+    con = get_connection()
+    con.register("join_facts", facts.select(["user_ids", "values"]))
+    con.register("join_users", users.select(["user_ids", "segment"]))
+    try:
+        return normalize_result(con.execute(JOIN_SELECT).fetch_arrow_table(), key_name="segment")
+    finally:
+        con.unregister("join_facts")
+        con.unregister("join_users")
@@ -1,20 +1,14 @@
-import csv
 import json
 from pathlib import Path
 
-from src.profiling_utils import timer
-
+import pyarrow as pa
 
-def _write_output(rows: list[dict], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["event_type", "count", "sum", "mean"])
-        writer.writeheader()
-        writer.writerows(rows)
+from src.profiling_utils import timer
+from src.results import table_from_totals, write_result_csv
 
 
 @timer
-def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
+def run(input_path: Path, output_path: Path | None = None) -> pa.Table:
     """
     Variant F: Semi-structured JSONL parsing (row-wise), demonstrates overhead.
     """
@@ -28,18 +22,10 @@ def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
             group["count"] += 1
             group["sum"] += val
 
-    rows = [
-        {
-            "event_type": et,
-            "count": stats["count"],
-            "sum": stats["sum"],
-            "mean": stats["sum"] / stats["count"] if stats["count"] else 0.0,
-        }
-        for et, stats in sorted(totals.items())
-    ]
+    results = table_from_totals(totals)
 
     if output_path:
-        _write_output(rows, output_path)
+        write_result_csv(results, output_path)
 
-    return rows
+    return results
 
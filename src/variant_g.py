@@ -1,46 +1,43 @@
-import csv
 from pathlib import Path
+from typing import Iterable
 
 import pandas as pd
+import pyarrow as pa
 
 from src.profiling_utils import timer
+from src.results import table_from_totals, write_result_csv
 
 CHUNK_ROWS = 200_000
 
 
-def _write_output(rows: list[dict], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["event_type", "count", "sum", "mean"])
-        writer.writeheader()
-        writer.writerows(rows)
-
-
 @timer
-def run(input_path: Path, output_path: Path | None = None) -> list[dict]:
+def run(input_path: Path, output_path: Path | None = None) -> pa.Table:
     """
     Variant G: Out-of-core streaming using chunked CSV reads to handle oversized data.
     """
+    rows = _aggregate_chunks(pd.read_csv(input_path, chunksize=CHUNK_ROWS))
+
+    if output_path:
+        write_result_csv(rows, output_path)
+
+    return rows
+
+
+def transform(table: pa.Table) -> pa.Table:
+    """Variant G transform: the same chunk-at-a-time aggregation over an in-memory table."""
+    return _aggregate_chunks(
+        batch.to_pandas() for batch in table.select(["event_types", "values"]).to_batches(CHUNK_ROWS)
+    )
+
+
+def _aggregate_chunks(chunks: Iterable[pd.DataFrame]) -> pa.Table:
     totals: dict[int, dict[str, float]] = {}
-    for chunk in pd.read_csv(input_path, chunksize=CHUNK_ROWS):
+    for chunk in chunks:
         grouped = chunk.groupby("event_types")["values"].agg(["count", "sum"])
         for event_type, row in grouped.iterrows():
             group = totals.setdefault(int(event_type), {"count": 0, "sum": 0.0})
             group["count"] += int(row["count"])
             group["sum"] += float(row["sum"])
 
-    rows = [
-        {
-            "event_type": et,
-            "count": stats["count"],
-            "sum": stats["sum"],
-            "mean": stats["sum"] / stats["count"] if stats["count"] else 0.0,
-        }
-        for et, stats in sorted(totals.items())
-    ]
-
-    if output_path:
-        _write_output(rows, output_path)
-
-    return rows
+    return table_from_totals(totals)
 
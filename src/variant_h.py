@@ -0,0 +1,28 @@
+from pathlib import Path
+
+import pyarrow as pa
+
+from src.config import settings
+from src.pipeline import aggregate_table, run_pipelined
+from src.profiling_utils import timer
+from src.results import write_result_csv
+
+
+@timer
+def run(input_path: Path, output_path: Path | None = None) -> pa.Table:
+    """
+    Variant H: pipelined streaming; a background reader prefetches the next
+    batches into a bounded queue while the current batch is aggregated.
+    Accepts Parquet, CSV or JSONL input (format inferred from the extension).
+    """
+    rows, _ = run_pipelined(input_path, queue_depth=settings.PREFETCH_DEPTH)
+
+    if output_path:
+        write_result_csv(rows, output_path)
+
+    return rows
+
+
+def transform(table: pa.Table) -> pa.Table:
+    """Variant H transform: the pipeline's batch aggregation with no reader to overlap."""
+    return aggregate_table(table)